@@ -2,7 +2,9 @@ import streamlit as st
 from pathlib import Path
 from graphviz import Digraph
 
-from utils.loaders import load_json, load_index
+from utils.lod import GROUP_FIELDS, LOD_THRESHOLD, UNKNOWN_GROUP, aggregate, merge_edges
+from utils.snapshot import load_catalog
+from utils.views import graphviz_chart_cached
 
 # ==================================================
 # PAGE CONFIG
@@ -20,18 +22,16 @@ st.caption("Past learning → NUS courses → University of Oulu courses")
 # ==================================================
 DATA_DIR = Path("data")
 
-SOURCE_INDEX = DATA_DIR / "registries" / "source_courses_index.json"
-MAPPING_INDEX = DATA_DIR / "registries" / "mapping_index.json"
-
-SOURCE_DIR = DATA_DIR / "source_courses"
-PAST_DIR = DATA_DIR / "past_courses"
-MAPPING_DIR = DATA_DIR / "mappings"
-
 # ==================================================
 # LOAD REGISTRIES
 # ==================================================
-source_courses = load_index(SOURCE_INDEX)
-mapping_index = load_index(MAPPING_INDEX)
+# Compiled snapshot (python -m utils.snapshot) when fresh, else a live
+# build from the data/ tree.
+catalog = load_catalog(DATA_DIR)
+registry = catalog["registry"]
+
+source_courses = registry.sources
+mapping_index = registry.mapping_index
 
 if not source_courses:
     st.error("❌ No source courses found.")
@@ -41,6 +41,18 @@ if not mapping_index:
     st.warning("⚠️ No mappings defined yet.")
     st.stop()
 
+# ==================================================
+# LEVEL OF DETAIL
+# ==================================================
+st.sidebar.header("🧩 Level of Detail")
+
+group_by = st.sidebar.radio("Group past courses by", GROUP_FIELDS)
+lod_threshold = st.sidebar.number_input(
+    "Group when more past courses than",
+    min_value=1,
+    value=LOD_THRESHOLD
+)
+
 # ==================================================
 # BUILD GLOBAL GRAPH
 # ==================================================
@@ -56,6 +68,12 @@ dot = Digraph(
 
 added_nodes = set()
 
+# Past courses are collected first and drawn after the loop, grouped into
+# super-nodes when there are too many of them.
+past_labels = {}
+past_group_of = {}
+past_edges = []
+
 # --------------------------------------------------
 # LOOP OVER SOURCE COURSES
 # --------------------------------------------------
@@ -66,28 +84,22 @@ for src in source_courses:
     # -----------------------------
     # Load past course provenance
     # -----------------------------
-    past_file = PAST_DIR / f"{src_code}.json"
-    past_data = load_json(past_file) if past_file.exists() else {}
+    # catalog records are validated and normalised (utils.validation)
+    past_data = catalog["past_by_code"].get(src_code)
 
-    past_courses = past_data.get("past_courses", [])
-    direct_oulu = past_data.get("direct_oulu_links", [])
+    past_courses = past_data["past_courses"] if past_data else []
+    direct_oulu = past_data["direct_oulu_links"] if past_data else []
 
     # -----------------------------
     # Past Courses Nodes
     # -----------------------------
     for pc in past_courses:
         pc_id = f"PAST_{pc['course_name']}"
-        if pc_id not in added_nodes:
-            dot.node(
-                pc_id,
-                f"{pc['course_name']}\n({pc['institution']})",
-                shape="box",
-                style="filled",
-                fillcolor="#E8F0FE"
-            )
-            added_nodes.add(pc_id)
+        if pc_id not in past_labels:
+            past_labels[pc_id] = f"{pc['course_name']}\n({pc['institution']})"
+            past_group_of[pc_id] = pc[group_by] or UNKNOWN_GROUP
 
-        dot.edge(pc_id, src_code)
+        past_edges.append((pc_id, src_code, "evidence"))
 
     # -----------------------------
     # NUS Source Course Node
@@ -105,19 +117,11 @@ for src in source_courses:
     # -----------------------------
     # Mapping to Oulu Courses
     # -----------------------------
-    mapping_entry = next(
-        (m for m in mapping_index if m["source_course"] == src_code),
-        None
-    )
-
-    if not mapping_entry:
-        continue
-
-    mapping_data = load_json(MAPPING_DIR / mapping_entry["mapping_file"])
+    mapping_data = registry.mapping(src_code)
     if not mapping_data:
         continue
 
-    for tgt in mapping_data.get("target_courses", []):
+    for tgt in mapping_data["target_courses"]:
         tgt_code = tgt["course_code"]
         tgt_name = tgt["course_name"]
 
@@ -151,18 +155,50 @@ for src in source_courses:
 
         for pc in past_courses:
             pc_id = f"PAST_{pc['course_name']}"
-            dot.edge(
-                pc_id,
-                oulu_id,
-                style="dashed",
-                color="gray"
-            )
+            past_edges.append((pc_id, oulu_id, "readiness"))
+
+# --------------------------------------------------
+# PAST COURSES (INDIVIDUAL OR GROUPED)
+# --------------------------------------------------
+drill_down = []
+if len(past_group_of) > lod_threshold:
+    drill_down = st.sidebar.multiselect(
+        f"Drill down into {group_by}",
+        options=sorted(set(past_group_of.values()))
+    )
+
+past_rep, past_groups = aggregate(past_group_of, lod_threshold, expanded=drill_down)
+
+for pc_id, label in past_labels.items():
+    if past_rep[pc_id] == pc_id:
+        dot.node(
+            pc_id,
+            label,
+            shape="box",
+            style="filled",
+            fillcolor="#E8F0FE"
+        )
+
+for group_id, group in past_groups.items():
+    dot.node(
+        group_id,
+        f"{group['name']}\n({len(group['members'])} past courses)",
+        shape="box3d",
+        style="filled",
+        fillcolor="#C6DAFC"
+    )
+
+for pc_id, dst, kind, count in merge_edges(past_edges, past_rep):
+    edge_attrs = {"style": "dashed", "color": "gray"} if kind == "readiness" else {}
+    if count > 1:
+        edge_attrs["label"] = f"×{count}"
+    dot.edge(pc_id, dst, **edge_attrs)
 
 # ==================================================
 # RENDER
 # ==================================================
 st.subheader("📊 Global Learning & Transfer Graph")
-st.graphviz_chart(dot)
+graphviz_chart_cached(dot, "global_course_mapping")
 
 # ==================================================
 # LEGEND
@@ -170,6 +206,7 @@ st.graphviz_chart(dot)
 with st.expander("ℹ️ Legend"):
     st.markdown("""
 - **Blue**: Past learning (Coursera / prior foundation)
+- **Dark blue (stacked)**: Past courses grouped by institution / provider
 - **Yellow**: NUS courses
 - **Green**: University of Oulu credit mappings
 - **Teal**: Oulu advanced-readiness (non-credit)
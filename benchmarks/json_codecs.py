@@ -0,0 +1,77 @@
+"""
+Decode / encode throughput and encoded size of the installed codecs
+(utils.loaders.CODECS) on the real data files.
+
+    python -m benchmarks.json_codecs
+    python -m benchmarks.json_codecs --repeat 200 --dirs data/exports data/mappings
+
+Every readable *.json file in each directory is decoded once with stdlib
+json, then each codec encodes (compact and pretty, where it has a text
+format) and decodes it `repeat` times. Throughput is measured against the
+stdlib compact encoding so that codecs are compared on the same payload.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from utils.loaders import CODECS
+
+DIRS = [Path("data/exports"), Path("data/source_courses")]
+
+
+def load_documents(dir_path: Path):
+    docs = []
+    for file in sorted(dir_path.glob("*.json")):
+        try:
+            docs.append(json.loads(file.read_text(encoding="utf-8")))
+        except ValueError:
+            print(f"⚠️ Skipped {file}: unreadable JSON")
+    return docs
+
+
+def best_of(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench(docs, codec, pretty, repeat):
+    encoded = [codec.dumps(d, pretty) for d in docs]
+    size = sum(len(e) for e in encoded)
+    encode_s = best_of(lambda: [codec.dumps(d, pretty) for d in docs], repeat)
+    decode_s = best_of(lambda: [codec.loads(e) for e in encoded], repeat)
+    return size, encode_s, decode_s
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the JSON codecs on data/ files")
+    parser.add_argument("--dirs", type=Path, nargs="*", default=DIRS)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    print(f"Codecs: {', '.join(CODECS)}")
+    for dir_path in args.dirs:
+        docs = load_documents(dir_path)
+        if not docs:
+            continue
+        payload = sum(len(CODECS["json"].dumps(d)) for d in docs)
+        print(f"\n{dir_path} — {len(docs)} files, {payload / 1024:.1f} KiB compact JSON")
+        print(f"{'codec':>8} {'format':>8} {'size KiB':>9} {'enc MB/s':>9} {'dec MB/s':>9}")
+
+        for codec in CODECS.values():
+            for pretty in ([False] if codec.binary else [False, True]):
+                size, encode_s, decode_s = bench(docs, codec, pretty, args.repeat)
+                print(
+                    f"{codec.name:>8} {'pretty' if pretty else 'compact':>8} {size / 1024:>9.1f} "
+                    f"{payload / encode_s / 1e6:>9.1f} {payload / decode_s / 1e6:>9.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
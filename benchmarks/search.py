@@ -0,0 +1,76 @@
+"""
+Query latency of utils.search.SearchIndex at catalog scale.
+
+Builds an in-memory index of N synthetic courses whose texts are drawn
+from the vocabulary of the real data files (so term frequencies are
+realistic), compacts it, and times a set of queries.
+
+    python -m benchmarks.search                    # 1k / 10k / 100k documents
+    python -m benchmarks.search --sizes 100000 --repeat 200
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from utils.search import DATA_DIR, Doc, SearchIndex, refresh
+
+QUERIES = [
+    "laplace transform",
+    "anova",
+    "bode plots",
+    "electromagnetic wave propagation",
+    "regression analysis of variance",
+    "numerical methods for differential equations",
+]
+
+
+def real_texts():
+    index = SearchIndex()
+    refresh(index, DATA_DIR)
+    return [text for doc in index.docs if doc for text in doc.texts]
+
+
+def make_index(n, texts, seed=0):
+    rng = random.Random(seed)
+    words = " ".join(texts).split()
+    index = SearchIndex()
+    for i in range(n):
+        items = [" ".join(rng.choices(words, k=rng.randint(4, 14))) for _ in range(rng.randint(4, 10))]
+        index.add_documents(f"bench/{i}.json", (0, 0), [Doc("source", f"B{i:06d}", items[0], None, items)])
+    index.compact()
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark BM25 query latency")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("-k", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    texts = real_texts()
+    print(f"{'docs':>8} {'build s':>8} {'terms':>7} {'postings':>9} {'median ms':>10} {'p95 ms':>7} {'max ms':>7}")
+    for n in args.sizes:
+        started = time.perf_counter()
+        index = make_index(n, texts)
+        build_s = time.perf_counter() - started
+
+        timings = []
+        for _ in range(args.repeat):
+            for query in QUERIES:
+                started = time.perf_counter()
+                index.search(query, k=args.k)
+                timings.append((time.perf_counter() - started) * 1000)
+
+        timings = np.array(timings)
+        print(
+            f"{n:>8} {build_s:>8.2f} {index.matrix.shape[0]:>7} {index.matrix.nnz:>9} "
+            f"{np.median(timings):>10.2f} {np.percentile(timings, 95):>7.2f} {timings.max():>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
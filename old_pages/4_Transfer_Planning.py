@@ -1,7 +1,9 @@
 import streamlit as st
 from pathlib import Path
 
-from utils.loaders import load_json, load_index
+from utils.registry import load_registry
+from utils.targets import load_target_index
+from utils.validation import load_valid
 
 # ==================================================
 # PAGE CONFIG
@@ -19,18 +21,15 @@ st.caption("Source → Target course equivalency and academic justification")
 # ==================================================
 DATA_DIR = Path("data")
 
-SOURCE_INDEX = DATA_DIR / "registries" / "source_courses_index.json"
-MAPPING_INDEX = DATA_DIR / "registries" / "mapping_index.json"
-
 SOURCE_DIR = DATA_DIR / "source_courses"
 TARGET_DIR = DATA_DIR / "target_courses" / "oulu"
-MAPPING_DIR = DATA_DIR / "mappings"
 
 # ==================================================
-# LOAD INDICES
+# LOAD REGISTRY
 # ==================================================
-source_courses = load_index(SOURCE_INDEX)
-mapping_index = load_index(MAPPING_INDEX)
+# Hashed lookups, rebuilt only when a registry or mapping file changes
+registry = load_registry(DATA_DIR)
+source_courses = registry.sources
 
 if not source_courses:
     st.error("No source courses found.")
@@ -52,12 +51,15 @@ selected_label = st.selectbox(
 )
 
 source_code = source_map[selected_label]
+source_entry = registry.source(source_code)
 
 # ==================================================
 # LOAD SOURCE COURSE DETAIL
 # ==================================================
+# Records from load_valid are schema-checked and normalised (utils.validation):
+# every field read below is present, so no per-field fallbacks are needed.
 source_course_path = SOURCE_DIR / f"{source_code}.json"
-source_course = load_json(source_course_path)
+source_course = load_valid(source_course_path, "source_course")
 
 if not source_course:
     st.warning(f"No detailed data found for {source_code}")
@@ -65,17 +67,11 @@ if not source_course:
 # ==================================================
 # FIND MAPPING FILE
 # ==================================================
-mapping_entry = next(
-    (m for m in mapping_index if m["source_course"] == source_code),
-    None
-)
-
-if not mapping_entry:
+if not registry.mapping_file(source_code):
     st.warning("No transfer mapping defined for this course.")
     st.stop()
 
-mapping_path = MAPPING_DIR / mapping_entry["mapping_file"]
-mapping_data = load_json(mapping_path)
+mapping_data = registry.mapping(source_code)
 
 if not mapping_data:
     st.error("Mapping file could not be loaded.")
@@ -86,11 +82,12 @@ if not mapping_data:
 # ==================================================
 with st.expander("📘 Source Course Details", expanded=True):
     if source_course:
-        st.markdown(f"**Course:** {source_course.get('course_name', 'unknown')}")
-        st.markdown(f"**Code:** {source_course.get('course_code', 'unknown')}")
-        st.markdown(f"**Credits:** {source_course.get('credits', 'unknown')}")
-        st.markdown("**Description:**")
-        st.write(source_course.get("course_description", "unknown"))
+        detail = source_course["source_course"]
+        st.markdown(f"**Course:** {detail['name']}")
+        st.markdown(f"**Code:** {detail['code']}")
+        st.markdown(f"**Credits:** {detail['credits']}")
+        st.markdown("**Learning objectives:**")
+        st.write(detail["learning_objectives"])
     else:
         st.info("Only basic source metadata available.")
 
@@ -99,13 +96,14 @@ with st.expander("📘 Source Course Details", expanded=True):
 # ==================================================
 st.subheader("2️⃣ Recommended University of Oulu Courses")
 
-targets = mapping_data.get("target_courses", [])
+targets = mapping_data["target_courses"]
+target_index = load_target_index(TARGET_DIR)
 
 if not targets:
     st.info("No target courses mapped.")
     st.stop()
 
-for target in targets:
+for position, target in enumerate(targets):
     with st.container():
         st.markdown("---")
         st.markdown(f"### 🎯 {target['course_name']} ({target['ects']} ECTS)")
@@ -113,22 +111,34 @@ for target in targets:
         st.markdown(f"**Mapping type:** `{target['mapping_type']}`")
         st.markdown(f"**Justification:** {target['justification']}")
 
-        if target.get("url"):
+        if target["url"]:
             st.link_button("Open course page", target["url"])
 
         # ----------------------------------------------
-        # Load full target course spec (if exists)
+        # Full target course spec (if exists)
         # ----------------------------------------------
-        target_file = TARGET_DIR / f"{target['course_code']}_*.json"
-        matched_files = list(TARGET_DIR.glob(f"{target['course_code']}*.json"))
-
-        if matched_files:
-            target_full = load_json(matched_files[0])
+        # Resolves bare (805305A) and suffixed (805305A_...) codes alike.
+        # The summary comes from the target registry; the spec itself is
+        # only read once the user asks for it.
+        target_path = target_index.path(target["course_code"])
+        summary = target_index.summary(target["course_code"])
+
+        if target_path:
+            if summary:
+                st.markdown(
+                    f"**Level:** {summary['level']} · "
+                    f"**Teaching period:** {', '.join(summary['teaching_period']) or 'unknown'}"
+                )
             with st.expander("📄 Full Target Course Details"):
-                st.markdown(f"**Faculty:** {target_full['target_course'].get('faculty', 'unknown')}")
-                st.markdown(f"**Level:** {target_full['target_course'].get('level', 'unknown')}")
-                st.markdown("**Learning Outcomes:**")
-                st.write(target_full["target_course"].get("learning_outcomes", []))
+                if st.checkbox("Load specification", key=f"target_full_{source_code}_{position}_{target['course_code']}"):
+                    target_full = load_valid(target_path, "target_course")
+                    if target_full:
+                        st.markdown(f"**Faculty:** {target_full['target_course']['faculty']}")
+                        st.markdown(f"**Level:** {target_full['target_course']['level']}")
+                        st.markdown("**Learning Outcomes:**")
+                        st.write(target_full["target_course"]["learning_outcomes"])
+                    else:
+                        st.error(f"{target_path.name} could not be loaded.")
         else:
             st.info("Full target course specification not yet available.")
 
@@ -137,8 +147,8 @@ for target in targets:
 # ==================================================
 st.subheader("3️⃣ Overall Transfer Recommendation")
 
-st.markdown(f"**Recommendation:** {mapping_data.get('overall_recommendation', 'unknown')}")
-st.markdown(f"**Confidence:** {mapping_data.get('confidence', 'unknown')}")
+st.markdown(f"**Recommendation:** {mapping_data['overall_recommendation']}")
+st.markdown(f"**Confidence:** {mapping_data['confidence']}")
 
 from graphviz import Digraph
 
@@ -152,11 +162,8 @@ def render_course_graph(source_course, mapping_data):
     Past Courses → NUS Course → Oulu Extra Courses
     """
 
-    # --------------------------------------------------
-    # Defensive extraction (NO KeyError possible)
-    # --------------------------------------------------
-    course_code = source_course.get("course_code", "UNKNOWN")
-    course_name = source_course.get("course_name", "Unknown Course")
+    course_code = source_course["course_code"]
+    course_name = source_course["course_name"]
 
     # Optional: past courses (may not exist yet)
     past_courses = source_course.get("previous_courses", [])
@@ -205,9 +212,9 @@ def render_course_graph(source_course, mapping_data):
     # --------------------------------------------------
     # Column 3: Oulu Extra Courses
     # --------------------------------------------------
-    for target in mapping_data.get("target_courses", []):
-        target_code = target.get("course_code", "UNKNOWN")
-        target_name = target.get("course_name", "Unknown")
+    for target in mapping_data["target_courses"]:
+        target_code = target["course_code"]
+        target_name = target["course_name"]
 
         oulu_label = f"{target_code}\n{target_name}"
 
@@ -225,5 +232,5 @@ def render_course_graph(source_course, mapping_data):
 
 
 
-graph = render_course_graph(source_course, mapping_data)
+graph = render_course_graph(source_entry, mapping_data)
 st.graphviz_chart(graph)
@@ -1,8 +1,15 @@
 import streamlit as st
 from pathlib import Path
-import json
 from graphviz import Digraph
 
+from utils.graph_index import load_graph_index
+from utils.graph_stream import should_stream, stream_edges, stream_nodes
+from utils.layout import PINNED_GRAPH_ATTR, load_layout, pinned_attrs
+from utils.loaders import codec_for
+from utils.lod import GROUP_FIELDS, LOD_THRESHOLD, aggregate, merge_edges, past_group, provider_by_institution
+from utils.snapshot import load_catalog
+from utils.views import graphviz_chart_cached, paged_dataframe, paged_json
+
 # ==================================================
 # PAGE CONFIG
 # ==================================================
@@ -27,25 +34,90 @@ if not GRAPH_JSON_PATH.exists():
 # ==================================================
 # LOAD JSON
 # ==================================================
-with GRAPH_JSON_PATH.open("r", encoding="utf-8") as f:
-    graph_data = json.load(f)
+# Compact graph model (utils.graph_model): nodes and edges are views over
+# interned arrays, and large exports were streamed in rather than loaded whole.
+catalog = load_catalog(Path("data"))
+model = catalog["graph_model"]
+
+if model is None:
+    st.error("❌ course_mapping_graph.json could not be parsed")
+    st.stop()
 
-nodes = graph_data.get("nodes", [])
-edges = graph_data.get("edges", [])
-metadata = graph_data.get("metadata", {})
+nodes = model.nodes()
+metadata = model.metadata
 
 # ==================================================
 # SIDEBAR FILTERS
 # ==================================================
 st.sidebar.header("🔎 Filters")
 
-node_types = sorted(set(n["type"] for n in nodes))
+node_types = sorted(model.type_names)
 visible_types = st.sidebar.multiselect(
     "Show node types",
     node_types,
     default=node_types
 )
 
+st.sidebar.header("🧩 Level of Detail")
+
+group_by = st.sidebar.radio("Group past courses by", GROUP_FIELDS)
+lod_threshold = st.sidebar.number_input(
+    "Group when more past courses than",
+    min_value=1,
+    value=LOD_THRESHOLD
+)
+
+# ==================================================
+# FOCUS MODE (k-HOP NEIGHBOURHOOD)
+# ==================================================
+st.sidebar.header("🎯 Focus")
+
+graph_index = load_graph_index(GRAPH_JSON_PATH)
+
+focus_mode = st.sidebar.checkbox("Focus on one course (k-hop view)")
+
+if "expanded_nodes" not in st.session_state:
+    st.session_state.expanded_nodes = []
+
+focus_node_ids = None
+
+if focus_mode and nodes:
+    focus_id = st.sidebar.selectbox(
+        "Focus course",
+        options=model.node_ids(),
+        format_func=lambda nid: model.label(nid).replace("\n", " ")
+    )
+    radius = st.sidebar.slider("Radius (hops)", min_value=1, max_value=4, value=2)
+    node_budget = st.sidebar.number_input("Node budget", min_value=10, max_value=2000, value=150, step=10)
+
+    expanded = [nid for nid in st.session_state.expanded_nodes if nid in model]
+
+    # Focus neighbourhood first, then one hop around every expanded node
+    focus_ids, truncated = graph_index.neighbourhood([focus_id], radius, max_nodes=node_budget)
+    focus_node_ids = list(focus_ids)
+    if expanded and not truncated:
+        extra_ids, truncated = graph_index.neighbourhood(expanded, 1, max_nodes=node_budget)
+        seen = set(focus_ids)
+        focus_node_ids += [nid for nid in extra_ids if nid not in seen]
+        truncated = truncated or len(focus_node_ids) > node_budget
+        focus_node_ids = focus_node_ids[:node_budget]
+
+    if truncated:
+        st.sidebar.warning(f"Neighbourhood truncated at {node_budget} nodes.")
+
+    expand_id = st.sidebar.selectbox(
+        "Expand course",
+        options=focus_node_ids,
+        format_func=lambda nid: model.label(nid).replace("\n", " ")
+    )
+    col_expand, col_reset = st.sidebar.columns(2)
+    if col_expand.button("➕ Expand") and expand_id not in st.session_state.expanded_nodes:
+        st.session_state.expanded_nodes.append(expand_id)
+        st.rerun()
+    if col_reset.button("↺ Reset"):
+        st.session_state.expanded_nodes = []
+        st.rerun()
+
 # ==================================================
 # BUILD TABLE DATA
 # ==================================================
@@ -77,34 +149,41 @@ tab_past, tab_source, tab_target = st.tabs(
 
 with tab_past:
     if past_rows:
-        st.dataframe(past_rows, use_container_width=True)
+        paged_dataframe(past_rows, "past_rows")
     else:
         st.info("No past courses available.")
 
 with tab_source:
     if source_rows:
-        st.dataframe(source_rows, use_container_width=True)
+        paged_dataframe(source_rows, "source_rows")
     else:
         st.info("No NUS courses available.")
 
 with tab_target:
     if target_rows:
-        st.dataframe(target_rows, use_container_width=True)
+        paged_dataframe(target_rows, "target_rows")
     else:
         st.info("No Oulu courses available.")
 
 # ==================================================
 # GRAPH SETUP
 # ==================================================
-dot = Digraph(
-    format="png",
-    graph_attr={
-        "rankdir": "LR",
-        "splines": "ortho",
-        "nodesep": "0.9",
-        "ranksep": "1.3"
-    }
-)
+# Draw from stored coordinates when the export has a layout sidecar
+# (python -m utils.layout); otherwise let Graphviz lay the graph out.
+layout = load_layout(GRAPH_JSON_PATH, model.as_graph_data())
+
+if layout:
+    dot = Digraph(format="png", engine="neato", graph_attr=PINNED_GRAPH_ATTR)
+else:
+    dot = Digraph(
+        format="png",
+        graph_attr={
+            "rankdir": "LR",
+            "splines": "ortho",
+            "nodesep": "0.9",
+            "ranksep": "1.3"
+        }
+    )
 
 # ==================================================
 # COLOR MAP
@@ -118,10 +197,35 @@ COLOR_BY_TYPE = {
 # ==================================================
 # ADD NODES
 # ==================================================
-visible_node_ids = set()
+# In focus mode only the neighbourhood is drawn, so render cost is bounded
+# by the node budget rather than the size of the export.
+if focus_node_ids is not None:
+    drawn_nodes = [model.node(nid) for nid in focus_node_ids]
+else:
+    drawn_nodes = nodes
+
+drawn_nodes = [n for n in drawn_nodes if n["type"] in visible_types]
+visible_node_ids = {n["id"] for n in drawn_nodes}
+
+# Too many past courses → one super-node per institution / provider
+providers = provider_by_institution(catalog["past_by_code"])
+past_group_of = {
+    n["id"]: past_group(n, group_by, providers)
+    for n in drawn_nodes
+    if n["type"] == "past"
+}
 
-for node in nodes:
-    if node["type"] not in visible_types:
+drill_down = []
+if len(past_group_of) > lod_threshold:
+    drill_down = st.sidebar.multiselect(
+        f"Drill down into {group_by}",
+        options=sorted(set(past_group_of.values()))
+    )
+
+past_rep, past_groups = aggregate(past_group_of, lod_threshold, expanded=drill_down)
+
+for node in drawn_nodes:
+    if past_rep.get(node["id"], node["id"]) != node["id"]:
         continue
 
     dot.node(
@@ -129,26 +233,39 @@ for node in nodes:
         node["label"],
         shape="box",
         style="filled",
-        fillcolor=COLOR_BY_TYPE.get(node["type"], "#FFFFFF")
+        fillcolor=COLOR_BY_TYPE.get(node["type"], "#FFFFFF"),
+        **pinned_attrs(layout, node["id"])
+    )
+
+for group_id, group in past_groups.items():
+    dot.node(
+        group_id,
+        f"{group['name']}\n({len(group['members'])} past courses)",
+        shape="box3d",
+        style="filled",
+        fillcolor="#C6DAFC"
     )
-    visible_node_ids.add(node["id"])
 
 # ==================================================
 # ADD EDGES
 # ==================================================
-for edge in edges:
-    if edge["from"] in visible_node_ids and edge["to"] in visible_node_ids:
-        dot.edge(
-            edge["from"],
-            edge["to"],
-            label=edge.get("relation", "")
-        )
+if focus_node_ids is not None:
+    visible_edges = graph_index.edges_among(visible_node_ids)
+else:
+    visible_edges = model.edges_among(visible_node_ids)
+
+for src, tgt, relation, count in merge_edges(visible_edges, past_rep):
+    dot.edge(
+        src,
+        tgt,
+        label=f"{relation} ×{count}" if count > 1 else relation
+    )
 
 # ==================================================
 # GRAPH RENDER
 # ==================================================
 st.subheader("🧭 Course Mapping Graph")
-st.graphviz_chart(dot)
+graphviz_chart_cached(dot, "course_mapping_graph")
 
 # ==================================================
 # METADATA & STATS
@@ -158,19 +275,30 @@ with st.expander("📌 Graph Metadata"):
 
 with st.expander("📈 Graph Statistics"):
     st.write({
-        "total_nodes": len(nodes),
-        "total_edges": len(edges),
-        "node_types": {
-            t: sum(1 for n in nodes if n["type"] == t)
-            for t in node_types
-        }
+        "total_nodes": len(model),
+        "total_edges": model.edge_count,
+        "node_types": model.type_counts()
     })
 
 # ==================================================
 # RAW JSON VIEW
 # ==================================================
 with st.expander("🗂 Raw JSON"):
-    st.json(graph_data)
+    if should_stream(GRAPH_JSON_PATH):
+        # Too large to decode whole: stream only the records of the nodes
+        # currently shown, filtering while the file is scanned.
+        st.caption("Large export — showing the raw records of the visible nodes only.")
+        paged_json(
+            lambda: {
+                "nodes": list(stream_nodes(GRAPH_JSON_PATH, ids=visible_node_ids)),
+                "edges": list(stream_edges(GRAPH_JSON_PATH, node_ids=visible_node_ids)),
+            },
+            "raw_graph"
+        )
+    else:
+        # decoded on its own, not through the shared JSON cache, so the
+        # whole export is not kept in memory next to the compact model
+        paged_json(lambda: codec_for(GRAPH_JSON_PATH).loads(GRAPH_JSON_PATH.read_bytes()), "raw_graph")
 
 
 # import streamlit as st
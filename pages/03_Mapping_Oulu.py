@@ -1,10 +1,17 @@
 import streamlit as st
+from contextlib import closing
 from pathlib import Path
-import json
 from graphviz import Digraph
-from collections import defaultdict
 import pandas as pd
 
+from utils import journal, notes_store
+from utils.closure import chain_closure_map
+from utils.graph_index import load_graph_index
+from utils.impact import load_impact_index
+from utils.layout import PINNED_GRAPH_ATTR, load_layout, pinned_attrs
+from utils.snapshot import load_catalog
+from utils.views import graphviz_chart_cached, paged_json
+
 # ==================================================
 # PAGE CONFIG
 # ==================================================
@@ -20,6 +27,7 @@ DATA_DIR = Path("data/exports")
 GRAPH_JSON_PATH = DATA_DIR / "course_mapping_graph.json"
 NOTES_PATH = DATA_DIR / "course_notes.json"
 LINKS_PATH = DATA_DIR / "course_links.json"
+DB_PATH = DATA_DIR / notes_store.DB_NAME
 
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -30,51 +38,50 @@ if not GRAPH_JSON_PATH.exists():
 # ==================================================
 # LOAD GRAPH
 # ==================================================
-with GRAPH_JSON_PATH.open("r", encoding="utf-8") as f:
-    graph_data = json.load(f)
-
-nodes = graph_data["nodes"]
-edges = graph_data["edges"]
+catalog = load_catalog(Path("data"))
+model = catalog["graph_model"]
 
-node_by_id = {n["id"]: n for n in nodes}
-node_type = {n["id"]: n["type"] for n in nodes}
+if model is None:
+    st.error("❌ course_mapping_graph.json could not be parsed")
+    st.stop()
 
-past_nodes = {n["id"]: n for n in nodes if n["type"] == "past"}
-target_nodes = {n["id"]: n for n in nodes if n["type"] == "target"}
+past_ids = model.node_ids("past")
+target_ids = model.node_ids("target")
 
 # ==================================================
 # LOAD NOTES & LINKS (PERSISTENT)
 # ==================================================
-notes_db = json.load(NOTES_PATH.open()) if NOTES_PATH.exists() else {}
-links_db = json.load(LINKS_PATH.open()) if LINKS_PATH.exists() else {}
+# SQLite backend is used once the database exists (see the sidebar
+# migration button or `python -m utils.notes_store`); JSON otherwise.
+# The JSON files are a base + append-only journal of edits (utils.journal).
+# A connection is opened per read / save and closed again, so reruns do
+# not leak handles or WAL readers.
+use_sqlite = DB_PATH.exists()
+
+if use_sqlite:
+    with closing(notes_store.connect(DB_PATH)) as store:
+        notes_db = notes_store.load_notes(store)
+        links_db = notes_store.load_links(store)
+else:
+    notes_db = journal.load_journaled(NOTES_PATH)
+    links_db = journal.load_journaled(LINKS_PATH)
 
 # ==================================================
 # BUILD PATHS (PAST → NUS → OULU)
 # ==================================================
-past_to_nus = defaultdict(set)
-nus_to_oulu = defaultdict(set)
-
-for e in edges:
-    src, tgt = e.get("from"), e.get("to")
-    if not src or not tgt:
-        continue
-    if node_type.get(src) == "past" and node_type.get(tgt) == "source":
-        past_to_nus[src].add(tgt)
-    if node_type.get(src) == "source" and node_type.get(tgt) == "target":
-        nus_to_oulu[src].add(tgt)
-
-collapsed = defaultdict(set)
-for p, nus_set in past_to_nus.items():
-    for n in nus_set:
-        for o in nus_to_oulu.get(n, []):
-            collapsed[p].add(o)
+# CSR adjacency index, cached per export file hash; the collapse is a
+# sparse boolean product along MAPPING_CHAIN, cached until the edges change.
+MAPPING_CHAIN = ["past", "source", "target"]
+
+graph_index = load_graph_index(GRAPH_JSON_PATH)
+collapsed = chain_closure_map(graph_index, MAPPING_CHAIN)
 
 # ==================================================
 # SIDEBAR FILTER
 # ==================================================
 st.sidebar.header("🎯 Filter")
 
-past_label_to_id = {v["label"]: k for k, v in past_nodes.items()}
+past_label_to_id = {model.label(pid): pid for pid in past_ids}
 
 selected_labels = st.sidebar.multiselect(
     "Select Past Courses",
@@ -84,7 +91,21 @@ selected_labels = st.sidebar.multiselect(
 if selected_labels:
     selected_past_ids = {past_label_to_id[l] for l in selected_labels}
 else:
-    selected_past_ids = set(past_nodes.keys())
+    selected_past_ids = set(past_ids)
+
+st.sidebar.header("💽 Storage")
+
+if use_sqlite:
+    st.sidebar.caption(f"SQLite (WAL): {DB_PATH}")
+else:
+    st.sidebar.caption(f"JSON: {NOTES_PATH.name}, {LINKS_PATH.name}")
+    if st.sidebar.button("Migrate notes & links to SQLite"):
+        journal.compact(NOTES_PATH)
+        journal.compact(LINKS_PATH)
+        with closing(notes_store.connect(DB_PATH)) as conn:
+            n_notes, n_links = notes_store.migrate_from_json(conn, NOTES_PATH, LINKS_PATH)
+        st.sidebar.success(f"Migrated {n_notes} notes and {n_links} links.")
+        st.rerun()
 
 # ==================================================
 # COURSE LINK TABLES
@@ -95,10 +116,10 @@ tab_past_links, tab_oulu_links = st.tabs(["🟦 Past Course Links", "🟩 Oulu C
 
 # ---------- Past Links ----------
 past_link_rows = []
-for pid, n in past_nodes.items():
+for pid in past_ids:
     past_link_rows.append({
         "course_id": pid,
-        "course": n["label"],
+        "course": model.label(pid),
         "url": links_db.get(pid, "")
     })
 
@@ -117,10 +138,10 @@ with tab_past_links:
 
 # ---------- Oulu Links ----------
 oulu_link_rows = []
-for tid, n in target_nodes.items():
+for tid in target_ids:
     oulu_link_rows.append({
         "course_id": tid,
-        "course": n["label"],
+        "course": model.label(tid),
         "url": links_db.get(tid, "")
     })
 
@@ -141,13 +162,22 @@ with tab_oulu_links:
 # SAVE LINKS
 # ==================================================
 if st.button("💾 Save Course Links"):
-    for _, r in pd.concat([edited_past_links, edited_oulu_links]).iterrows():
-        links_db[r.course_id] = r.url
-
-    with LINKS_PATH.open("w", encoding="utf-8") as f:
-        json.dump(links_db, f, indent=2, ensure_ascii=False)
-
-    st.success("Course links saved permanently.")
+    # Only rows whose URL actually changed are written
+    changed_links = [
+        (course_id, value["url"])
+        for course_id, value in (
+            journal.diff_rows(past_links_df, edited_past_links, "course_id", ["url"])
+            + journal.diff_rows(oulu_links_df, edited_oulu_links, "course_id", ["url"])
+        )
+    ]
+
+    if use_sqlite:
+        with closing(notes_store.connect(DB_PATH)) as store:
+            notes_store.upsert_links(store, changed_links)
+    else:
+        journal.save_changes(LINKS_PATH, changed_links)
+
+    st.success(f"Course links saved permanently ({len(changed_links)} changed).")
 
 # ==================================================
 # MAPPING NOTES TABLE
@@ -160,9 +190,9 @@ for pid in selected_past_ids:
         key = f"{pid}__{tid}"
         record = notes_db.get(key, {})
         rows.append({
-            "past_course": past_nodes[pid]["label"],
+            "past_course": model.label(pid),
             "past_url": links_db.get(pid, ""),
-            "oulu_course": target_nodes[tid]["label"],
+            "oulu_course": model.label(tid),
             "oulu_url": links_db.get(tid, ""),
             "description": record.get("description", ""),
             "notes": record.get("notes", ""),
@@ -187,47 +217,95 @@ edited_notes = st.data_editor(
 # SAVE NOTES
 # ==================================================
 if st.button("💾 Save Mapping Notes"):
-    for _, r in edited_notes.iterrows():
-        notes_db[r.key] = {
-            "description": r.description,
-            "notes": r.notes
-        }
+    # Only rows whose description / notes actually changed are written
+    changed_notes = journal.diff_rows(
+        notes_df, edited_notes, "key", ["description", "notes"]
+    )
 
-    with NOTES_PATH.open("w", encoding="utf-8") as f:
-        json.dump(notes_db, f, indent=2, ensure_ascii=False)
+    if use_sqlite:
+        with closing(notes_store.connect(DB_PATH)) as store:
+            notes_store.upsert_notes(
+                store,
+                (
+                    (*notes_store.split_note_key(key), value["description"], value["notes"])
+                    for key, value in changed_notes
+                )
+            )
+    else:
+        journal.save_changes(NOTES_PATH, changed_notes)
 
-    st.success("Mapping notes saved permanently.")
+    st.success(f"Mapping notes saved permanently ({len(changed_notes)} changed).")
 
 # ==================================================
 # GRAPH (STRUCTURE ONLY)
 # ==================================================
-dot = Digraph(format="png", graph_attr={"rankdir": "LR", "nodesep": "1", "ranksep": "1.3"})
+layout = load_layout(GRAPH_JSON_PATH, model.as_graph_data())
+
+if layout:
+    dot = Digraph(format="png", engine="neato", graph_attr=PINNED_GRAPH_ATTR)
+else:
+    dot = Digraph(format="png", graph_attr={"rankdir": "LR", "nodesep": "1", "ranksep": "1.3"})
 
 mapped_targets = set()
 for pid in selected_past_ids:
     mapped_targets |= collapsed.get(pid, set())
 
 for pid in selected_past_ids:
-    dot.node(pid, past_nodes[pid]["label"], shape="box", style="filled", fillcolor="#E8F0FE")
+    dot.node(pid, model.label(pid), shape="box", style="filled", fillcolor="#E8F0FE",
+             **pinned_attrs(layout, pid))
 
 for tid in mapped_targets:
-    dot.node(tid, target_nodes[tid]["label"], shape="box", style="filled", fillcolor="#E6F4EA")
+    dot.node(tid, model.label(tid), shape="box", style="filled", fillcolor="#E6F4EA",
+             **pinned_attrs(layout, tid))
 
 for pid in selected_past_ids:
     for tid in collapsed.get(pid, []):
         dot.edge(pid, tid)
 
 st.subheader("🧭 Transfer Graph (Structure View)")
-st.graphviz_chart(dot)
+graphviz_chart_cached(dot, "past_to_oulu_graph")
+
+# ==================================================
+# IMPACT OF AN OULU COURSE
+# ==================================================
+# Reverse index Oulu → NUS → past, kept current per mapping file
+# (also available as `python -m utils.impact <code>`).
+st.subheader("🔎 Impact of an Oulu Course Change")
+
+impact_index = load_impact_index(Path("data"))
+impact_targets = impact_index.targets()
+
+if impact_targets:
+    impact_code = st.selectbox(
+        "Oulu course",
+        options=list(impact_targets),
+        format_func=lambda code: f"{code} — {impact_targets[code]}"
+    )
+
+    impact_rows = []
+    for entry in impact_index.impact(impact_code):
+        past_courses = entry["past_courses"] or [None]
+        for pc in past_courses:
+            impact_rows.append({
+                "nus_course": entry["source_code"],
+                "mapping_type": entry["mapping_type"],
+                "justification": entry["justification"],
+                "past_course": pc["course_name"] if pc else "",
+                "institution": pc["institution"] if pc else ""
+            })
+
+    st.dataframe(pd.DataFrame(impact_rows), use_container_width=True)
+else:
+    st.info("No mapping files list an Oulu course yet.")
 
 # ==================================================
 # DEBUG
 # ==================================================
 with st.expander("🛠 Stored Databases"):
     st.write("### Course Links")
-    st.json(links_db)
+    paged_json(links_db, "links_db")
     st.write("### Mapping Notes")
-    st.json(notes_db)
+    paged_json(notes_db, "notes_db")
 
 
 # import streamlit as st
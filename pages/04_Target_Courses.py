@@ -0,0 +1,91 @@
+import streamlit as st
+from pathlib import Path
+
+from utils.targets import load_target_registry
+from utils.validation import load_valid
+from utils.views import paged_dataframe
+
+# ==================================================
+# PAGE CONFIG
+# ==================================================
+st.set_page_config(page_title="Target Courses", layout="wide")
+
+st.title("🏫 Target Courses")
+st.caption("Courses offered by the target institutions")
+
+# ==================================================
+# PATHS
+# ==================================================
+DATA_DIR = Path("data")
+TARGET_ROOT = DATA_DIR / "target_courses"
+
+# ==================================================
+# LOAD REGISTRY
+# ==================================================
+# Compact summaries from data/registries/target_courses_index.json
+# (python -m utils.targets); full specs are read only when opened below.
+summaries = load_target_registry(DATA_DIR)
+
+if not summaries:
+    st.error("❌ No target courses found.")
+    st.stop()
+
+# ==================================================
+# FILTER
+# ==================================================
+st.sidebar.header("🎯 Filter")
+
+institutions = sorted({s["institution"] for s in summaries})
+selected_institutions = st.sidebar.multiselect("Institution", options=institutions)
+
+levels = sorted({s["level"] for s in summaries})
+selected_levels = st.sidebar.multiselect("Level", options=levels)
+
+visible = [
+    s for s in summaries
+    if (not selected_institutions or s["institution"] in selected_institutions)
+    and (not selected_levels or s["level"] in selected_levels)
+]
+
+# ==================================================
+# COURSE TABLE
+# ==================================================
+st.subheader(f"📋 Courses ({len(visible)})")
+
+rows = [
+    {
+        "code": s["course_code"],
+        "course": s["course_name"],
+        "institution": s["institution"],
+        "ects": str(s["ects"]),
+        "level": s["level"],
+        "teaching_period": ", ".join(s["teaching_period"]),
+    }
+    for s in visible
+]
+paged_dataframe(rows, "target_courses")
+
+# ==================================================
+# COURSE DETAIL (LAZY)
+# ==================================================
+if not visible:
+    st.stop()
+
+st.subheader("📄 Course Details")
+
+by_label = {f"{s['course_code']} — {s['course_name']}": s for s in visible}
+selected = by_label[st.selectbox("Course", options=list(by_label))]
+
+with st.expander(f"{selected['course_code']} — {selected['course_name']}", expanded=True):
+    spec = load_valid(TARGET_ROOT / selected["target_file"], "target_course")
+
+    if not spec:
+        st.error(f"{selected['target_file']} could not be loaded.")
+        st.stop()
+
+    course = spec["target_course"]
+    st.markdown(f"**Faculty:** {course['faculty']}")
+    st.markdown(f"**Credits:** {course['credits']} · **Level:** {course['level']}")
+    st.markdown(f"**Description:** {course['course_description']}")
+    st.markdown("**Learning Outcomes:**")
+    st.write(course["learning_outcomes"])
@@ -0,0 +1,68 @@
+import time
+
+import streamlit as st
+from pathlib import Path
+import pandas as pd
+
+from utils.search import KINDS, load_search_index, snippet
+
+# ==================================================
+# PAGE CONFIG
+# ==================================================
+st.set_page_config(page_title="Course Search", layout="wide")
+
+st.title("🔍 Course Search")
+st.caption("Full-text search over source, target and past course content (BM25)")
+
+# ==================================================
+# PATHS
+# ==================================================
+DATA_DIR = Path("data")
+
+# ==================================================
+# LOAD INDEX
+# ==================================================
+# Persisted in data/cache/search_index.pkl and refreshed per changed file
+# (also available as `python -m utils.search <query>`).
+index = load_search_index(DATA_DIR)
+
+# ==================================================
+# QUERY
+# ==================================================
+st.sidebar.header("🎯 Filter")
+
+selected_kinds = st.sidebar.multiselect("Course kind", options=KINDS)
+top_k = st.sidebar.number_input("Results", min_value=1, max_value=200, value=20)
+
+query = st.text_input("Search", placeholder="e.g. Laplace transform, ANOVA, Bode plots")
+
+if not query.strip():
+    st.info(f"{len(index)} courses indexed.")
+    st.stop()
+
+started = time.perf_counter()
+hits = index.search(query, k=int(top_k), kinds=selected_kinds or None)
+elapsed_ms = (time.perf_counter() - started) * 1000
+
+st.caption(f"{len(hits)} results in {elapsed_ms:.1f} ms across {len(index)} courses")
+
+if not hits:
+    st.warning("No matching courses.")
+    st.stop()
+
+# ==================================================
+# RESULTS
+# ==================================================
+rows = [
+    {
+        "score": round(hit.score, 2),
+        "kind": hit.doc.kind,
+        "code": hit.doc.code,
+        "course": hit.doc.title,
+        "match": snippet(hit.doc, query),
+        "file": hit.doc.file,
+    }
+    for hit in hits
+]
+
+st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
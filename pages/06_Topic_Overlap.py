@@ -0,0 +1,70 @@
+import streamlit as st
+from pathlib import Path
+import pandas as pd
+
+from utils.scorers import load_overlap_scores
+
+# ==================================================
+# PAGE CONFIG
+# ==================================================
+st.set_page_config(page_title="Topic Overlap", layout="wide")
+
+st.title("🧮 Topic Overlap: NUS ↔ Oulu")
+st.caption("TF-IDF cosine similarity of source topics / objectives and target outcomes / core topics")
+
+# ==================================================
+# PATHS
+# ==================================================
+DATA_DIR = Path("data")
+
+# ==================================================
+# SCORE ALL PAIRS
+# ==================================================
+# One sparse product for every source × target pair, recomputed only when
+# a course changes (also available as `python -m utils.scorers`).
+overlap = load_overlap_scores(DATA_DIR)
+
+if not overlap.sources or not overlap.targets:
+    st.error("❌ Need at least one valid source and one valid target course.")
+    st.stop()
+
+# ==================================================
+# SCORE MATRIX
+# ==================================================
+st.subheader("📊 Score Matrix")
+
+matrix_df = pd.DataFrame(
+    overlap.scores.round(3),
+    index=[c.code for c in overlap.sources],
+    columns=[c.code for c in overlap.targets]
+)
+st.dataframe(matrix_df, use_container_width=True)
+
+# ==================================================
+# RANKING PER SOURCE COURSE
+# ==================================================
+st.subheader("🏅 Best Matching Oulu Courses")
+
+source_labels = {f"{c.code} — {c.name}": c.code for c in overlap.sources}
+source_code = source_labels[st.selectbox("Source course", options=list(source_labels))]
+top_k = st.number_input("Show top", min_value=1, max_value=len(overlap.targets), value=min(5, len(overlap.targets)))
+
+ranked = overlap.top(source_code, int(top_k))
+
+if not ranked:
+    st.info("No Oulu course shares topics with this course.")
+    st.stop()
+
+st.dataframe(
+    pd.DataFrame([
+        {
+            "oulu_course": target.code,
+            "name": target.name,
+            "score": round(score, 3),
+            "shared_terms": ", ".join(overlap.shared_terms(source_code, target.code)),
+        }
+        for target, score in ranked
+    ]),
+    use_container_width=True,
+    hide_index=True
+)
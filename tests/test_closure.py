@@ -0,0 +1,78 @@
+import pytest
+
+from utils.closure import as_map, chain_closure, chain_closure_map, reachability
+from utils.graph_index import GraphIndex
+
+GRAPH = {
+    "nodes": [
+        {"id": "P1", "label": "P1", "type": "past"},
+        {"id": "P2", "label": "P2", "type": "past"},
+        {"id": "P3", "label": "P3", "type": "past"},
+        {"id": "S1", "label": "S1", "type": "source"},
+        {"id": "S2", "label": "S2", "type": "source"},
+        {"id": "T1", "label": "T1", "type": "target"},
+        {"id": "T2", "label": "T2", "type": "target"},
+        {"id": "T3", "label": "T3", "type": "target"},
+    ],
+    "edges": [
+        {"from": "P1", "to": "S1"},
+        {"from": "P2", "to": "S1"},
+        {"from": "P2", "to": "S2"},
+        {"from": "S1", "to": "T1"},
+        {"from": "S2", "to": "T2"},
+        {"from": "S2", "to": "T3"},
+        {"from": "T2", "to": "T3"},
+    ],
+}
+
+
+def _brute_force_chain(graph, chain):
+    types = {n["id"]: n["type"] for n in graph["nodes"]}
+    succ = {}
+    for e in graph["edges"]:
+        succ.setdefault(e["from"], set()).add(e["to"])
+
+    result = {}
+    for start in (n for n, t in types.items() if t == chain[0]):
+        frontier = {start}
+        for node_type in chain[1:]:
+            frontier = {m for n in frontier for m in succ.get(n, ()) if types[m] == node_type}
+        if frontier:
+            result[start] = frontier
+    return result
+
+
+def test_chain_closure_matches_brute_force():
+    index = GraphIndex(GRAPH)
+    for chain in (["past", "source", "target"], ["past", "source"], ["source", "target", "target"]):
+        assert chain_closure_map(index, chain) == _brute_force_chain(GRAPH, chain)
+
+
+def test_chain_closure_shape_and_cache():
+    index = GraphIndex(GRAPH)
+    rows, cols, matrix = chain_closure(index, ["past", "source", "target"])
+    assert rows == ["P1", "P2", "P3"]
+    assert cols == ["T1", "T2", "T3"]
+    assert matrix.shape == (3, 3)
+    assert chain_closure(index, ("past", "source", "target"))[2] is matrix
+    assert chain_closure_map(index, ["past", "source", "target"])["P1"] == {"T1"}
+
+
+def test_chain_needs_two_types():
+    index = GraphIndex(GRAPH)
+    with pytest.raises(ValueError):
+        chain_closure(index, ["past"])
+
+
+def test_reachability_with_hop_limit():
+    index = GraphIndex(GRAPH)
+    assert as_map(reachability(index, "past", "target")) == {
+        "P1": {"T1"},
+        "P2": {"T1", "T2", "T3"},
+    }
+    assert as_map(reachability(index, "past", "target", max_hops=1)) == {}
+    # T3 is reached from S2 directly and through T2
+    assert as_map(reachability(index, "source", "target", max_hops=1)) == {
+        "S1": {"T1"},
+        "S2": {"T2", "T3"},
+    }
@@ -0,0 +1,86 @@
+import json
+
+import numpy as np
+
+from utils.graph_index import GraphIndex, load_graph_index
+
+GRAPH = {
+    "nodes": [
+        {"id": "P1", "label": "P1", "type": "past"},
+        {"id": "P2", "label": "P2", "type": "past"},
+        {"id": "S1", "label": "S1", "type": "source"},
+        {"id": "S2", "label": "S2", "type": "source"},
+        {"id": "T1", "label": "T1", "type": "target"},
+        {"id": "T2", "label": "T2", "type": "target"},
+    ],
+    "edges": [
+        {"from": "P1", "to": "S1", "relation": "evidence_for"},
+        {"from": "P2", "to": "S1", "relation": "evidence_for"},
+        {"from": "P2", "to": "S2", "relation": "evidence_for"},
+        {"from": "S1", "to": "T1", "relation": "maps_to"},
+        {"from": "S1", "to": "T1", "relation": "maps_to"},
+        {"from": "S2", "to": "T2", "relation": "maps_to"},
+        {"from": "S2", "to": "GONE", "relation": "maps_to"},
+    ],
+}
+
+
+def test_csr_matches_edge_list():
+    index = GraphIndex(GRAPH)
+    n = len(index.ids)
+    assert len(index.fwd_indptr) == n + 1
+    assert index.fwd_indptr[-1] == len(index.fwd_indices) == 5  # duplicate and dangling edges dropped
+    assert np.all(np.diff(index.fwd_indptr) >= 0)
+
+
+def test_successors_and_predecessors():
+    index = GraphIndex(GRAPH)
+    assert index.successors("S1") == ["T1"]
+    assert sorted(index.successors("P2")) == ["S1", "S2"]
+    assert sorted(index.predecessors("S1")) == ["P1", "P2"]
+    assert index.predecessors("S1", node_type="source") == []
+    assert index.successors("GONE") == []
+    assert index.node_type("T2") == "target"
+
+
+def test_neighbourhood_is_bfs_in_both_directions():
+    index = GraphIndex(GRAPH)
+    ids, truncated = index.neighbourhood(["T1"], radius=1)
+    assert ids == ["T1", "S1"] and not truncated
+
+    ids, _ = index.neighbourhood(["T1"], radius=2)
+    assert ids[:2] == ["T1", "S1"]
+    assert sorted(ids[2:]) == ["P1", "P2"]
+
+    ids, truncated = index.neighbourhood(["T1"], radius=3, max_nodes=3)
+    assert len(ids) == 3 and truncated
+
+
+def test_edges_among_keeps_relations():
+    index = GraphIndex(GRAPH)
+    assert sorted(index.edges_among(["P2", "S1", "T1"])) == [
+        ("P2", "S1", "evidence_for"),
+        ("S1", "T1", "maps_to"),
+    ]
+
+
+def test_empty_graph():
+    index = GraphIndex({})
+    assert index.successors("X") == []
+    assert index.neighbourhood(["X"], radius=2) == ([], False)
+
+
+def test_load_graph_index_is_cached_per_content(tmp_path):
+    path = tmp_path / "course_mapping_graph.json"
+    path.write_text(json.dumps(GRAPH), encoding="utf-8")
+    first = load_graph_index(path)
+    assert load_graph_index(path) is first
+
+    copy = tmp_path / "copy.json"
+    copy.write_bytes(path.read_bytes())
+    assert load_graph_index(copy) is first
+
+    path.write_text(json.dumps({**GRAPH, "edges": GRAPH["edges"][:1]}), encoding="utf-8")
+    changed = load_graph_index(path)
+    assert changed is not first
+    assert changed.successors("S1") == []
@@ -0,0 +1,71 @@
+import io
+import json
+
+import pytest
+
+from utils import graph_stream
+from utils.graph_stream import iter_graph, read_metadata, stream_edges, stream_nodes
+
+GRAPH = {
+    "metadata": {"description": "test", "version": 1.5e3},
+    "count": 12.5e-3,
+    "nodes": [
+        {"id": "A", "type": "source", "weight": 1.25},
+        {"id": "B", "type": "target", "weight": -7e2},
+        {"id": "C", "type": "past", "weight": 10},
+    ],
+    "scale": -0.5E+2,
+    "edges": [
+        {"from": "C", "to": "A", "w": 0.1},
+        {"from": "A", "to": "B", "w": 3},
+    ],
+    "tail": 42,
+}
+
+
+@pytest.fixture
+def graph_path(tmp_path):
+    path = tmp_path / "course_mapping_graph.json"
+    path.write_text(json.dumps(GRAPH, indent=1), encoding="utf-8")
+    return path
+
+
+def _expected_items(path):
+    graph = json.loads(path.read_text(encoding="utf-8"))
+    return [
+        ("metadata", graph["metadata"]),
+        *(("node", n) for n in graph["nodes"]),
+        *(("edge", e) for e in graph["edges"]),
+    ]
+
+
+def test_iter_graph_matches_json_load_for_every_chunk_size(graph_path, monkeypatch):
+    expected = _expected_items(graph_path)
+    size = graph_path.stat().st_size
+    for chunk_size in range(1, size + 1):
+        monkeypatch.setattr(graph_stream, "CHUNK_SIZE", chunk_size)
+        assert list(iter_graph(graph_path)) == expected, chunk_size
+
+
+def test_numbers_split_across_chunks(monkeypatch):
+    text = "1.5 5e3 -12.25E-2 0 7 100"
+    expected = [1.5, 5e3, -12.25e-2, 0, 7, 100]
+    for chunk_size in range(1, len(text) + 1):
+        monkeypatch.setattr(graph_stream, "CHUNK_SIZE", chunk_size)
+        scan = graph_stream._Scanner(io.StringIO(text))
+        assert [scan.value() for _ in expected] == expected, chunk_size
+
+
+def test_truncated_export_raises(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('{"nodes": [{"id": "A"}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_graph(path))
+
+
+def test_filtered_readers(graph_path):
+    assert read_metadata(graph_path) == GRAPH["metadata"]
+    assert [n["id"] for n in stream_nodes(graph_path, types={"source", "past"})] == ["A", "C"]
+    assert list(stream_nodes(graph_path, ids={"B"}, fields=["id"])) == [{"id": "B"}]
+    assert list(stream_edges(graph_path, node_ids={"A", "B"})) == [GRAPH["edges"][1]]
+    assert len(list(stream_edges(graph_path, node_ids={"A"}, both_ends=False))) == 2
@@ -0,0 +1,92 @@
+import json
+import threading
+
+import pandas as pd
+
+from utils import journal
+
+
+def test_diff_rows_returns_changed_and_new_rows():
+    before = pd.DataFrame([
+        {"key": "a", "url": "x", "other": 1},
+        {"key": "b", "url": None, "other": 2},
+    ])
+    after = pd.DataFrame([
+        {"key": "a", "url": "x", "other": 9},
+        {"key": "b", "url": float("nan"), "other": 2},
+        {"key": "c", "url": "z", "other": 3},
+    ])
+    assert journal.diff_rows(before, after, "key", ["url"]) == [("c", {"url": "z"})]
+
+    after.loc[0, "url"] = "y"
+    assert journal.diff_rows(before, after, "key", ["url"])[0] == ("a", {"url": "y"})
+
+
+def test_journal_is_folded_over_the_base(tmp_path):
+    base = tmp_path / "course_notes.json"
+    base.write_text(json.dumps({"a": {"description": "old", "notes": "n"}}), encoding="utf-8")
+
+    journal.save_changes(base, [("a", {"description": "new"}), ("b", {"description": "b"})])
+    journal.save_changes(base, [("b", {"notes": "later"})])
+
+    assert journal.load_journaled(base) == {
+        "a": {"description": "new", "notes": "n"},
+        "b": {"description": "b", "notes": "later"},
+    }
+    # the base itself is untouched until compaction
+    assert json.loads(base.read_text(encoding="utf-8")) == {"a": {"description": "old", "notes": "n"}}
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    base = tmp_path / "course_links.json"
+    journal.append_journal(journal.journal_path_for(base), [("a", "x")])
+    with journal.journal_path_for(base).open("a", encoding="utf-8") as f:
+        f.write('{"key": "b", "val')
+    assert journal.load_journaled(base) == {"a": "x"}
+
+
+def test_compact_folds_and_removes_the_journal(tmp_path):
+    base = tmp_path / "course_links.json"
+    journal.save_changes(base, [("a", "x"), ("b", "y")])
+
+    assert journal.compact(base)
+    assert json.loads(base.read_text(encoding="utf-8")) == {"a": "x", "b": "y"}
+    assert not journal.journal_path_for(base).exists()
+    assert not journal._lock_path_for(base).exists()
+    assert journal.load_journaled(base) == {"a": "x", "b": "y"}
+
+
+def test_compact_skips_while_another_session_holds_the_lock(tmp_path):
+    base = tmp_path / "course_links.json"
+    journal.save_changes(base, [("a", "x")])
+    journal._lock_path_for(base).touch()
+
+    assert not journal.compact(base)
+    assert journal.journal_path_for(base).exists()
+    assert journal.load_journaled(base) == {"a": "x"}
+
+
+def test_concurrent_appends_and_compactions_lose_nothing(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "COMPACT_MAX_BYTES", 200)
+    base = tmp_path / "course_links.json"
+
+    errors = []
+
+    def session(n):
+        try:
+            for i in range(30):
+                journal.save_changes(base, [(f"{n}-{i}", i)])
+                # a session always sees its own saved edits
+                assert journal.load_journaled(base).get(f"{n}-{i}") == i
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    db = journal.load_journaled(base)
+    assert db == {f"{n}-{i}": i for n in range(6) for i in range(30)}
@@ -0,0 +1,135 @@
+import json
+import math
+
+import pytest
+
+from utils.search import (
+    B, K1, Doc, SearchIndex, read_index, refresh, save_index, tokenize,
+)
+
+DOCS = {
+    "a.json": [Doc("source", "EE2023", "Signals", "a.json", ["Laplace transform of signals", "Fourier series"])],
+    "b.json": [Doc("target", "T1", "Control", "b.json", ["Bode plots and feedback control"])],
+    "c.json": [
+        Doc("past", "EE2023", "DSP", "c.json", ["Discrete Fourier transform"]),
+        Doc("past", "EE2023", "Circuits", "c.json", ["Circuit analysis"]),
+    ],
+}
+
+
+def _index(docs=DOCS):
+    index = SearchIndex()
+    for file_key, file_docs in docs.items():
+        index.add_documents(file_key, (0, 0), file_docs)
+    return index
+
+
+def _bm25(docs, query):
+    """Reference BM25 over plain token lists."""
+    tokens = [[t for text in d.texts for t in tokenize(text)] for d in docs]
+    avgdl = sum(map(len, tokens)) / len(tokens)
+    scores = {}
+    for term in set(tokenize(query)):
+        df = sum(term in t for t in tokens)
+        if not df:
+            continue
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for d, t in zip(docs, tokens):
+            tf = t.count(term)
+            if tf:
+                norm = K1 * (1 - B + B * len(t) / avgdl)
+                key = (d.file, d.title)
+                scores[key] = scores.get(key, 0) + idf * tf * (K1 + 1) / (tf + norm)
+    return scores
+
+
+def _scores(index, query):
+    return {(hit.doc.file, hit.doc.title): hit.score for hit in index.search(query, k=100)}
+
+
+def test_tokenize_folds_plurals_and_drops_stopwords():
+    assert tokenize("The Bode plots of a class") == ["bode", "plot", "class"]
+
+
+def test_scores_match_reference_bm25():
+    index = _index()
+    all_docs = [d for docs in DOCS.values() for d in docs]
+    for query in ("fourier transform", "control", "laplace signals", "nothing here"):
+        expected = _bm25(all_docs, query)
+        assert _scores(index, query) == pytest.approx(expected, rel=1e-5)
+
+
+def test_compaction_does_not_change_results():
+    index = _index()
+    index.remove_file("b.json")
+    index.add_documents("b.json", (1, 1), [Doc("target", "T1", "Control", "b.json", ["Fourier control"])])
+    before = _scores(index, "fourier control")
+
+    index.compact()
+    assert index.delta == {}
+    assert index.n_dead == 0
+    assert len(index.docs) == len(index) == 4
+    assert _scores(index, "fourier control") == pytest.approx(before)
+
+    # delta segment on top of a compacted base
+    index.add_documents("d.json", (0, 0), [Doc("source", "X", "X", "d.json", ["fourier"])])
+    all_docs = [d for d in index.docs if d is not None]
+    assert _scores(index, "fourier control") == pytest.approx(_bm25(all_docs, "fourier control"), rel=1e-5)
+
+
+def test_removed_documents_are_not_returned():
+    index = _index()
+    index.remove_file("c.json")
+    assert {hit.doc.file for hit in index.search("fourier transform")} == {"a.json"}
+    assert len(index) == 2
+
+
+def test_kind_filter_and_top_k():
+    index = _index()
+    assert [hit.doc.kind for hit in index.search("fourier", kinds=["past"])] == ["past"]
+    assert len(index.search("fourier transform", k=1)) == 1
+
+
+def test_save_and_read_round_trip(tmp_path):
+    index = _index()
+    path = tmp_path / "cache" / "search_index.pkl"
+    save_index(index, path)
+    mtime = path.stat().st_mtime_ns
+
+    loaded = read_index(path)
+    assert _scores(loaded, "fourier") == pytest.approx(_scores(index, "fourier"))
+
+    # unchanged index: the file is left alone; no temp files are left behind
+    save_index(index, path)
+    assert path.stat().st_mtime_ns == mtime
+    assert [p.name for p in path.parent.iterdir()] == ["search_index.pkl"]
+
+
+def test_read_index_falls_back_to_empty(tmp_path):
+    path = tmp_path / "search_index.pkl"
+    assert len(read_index(path)) == 0
+    path.write_bytes(b"not a pickle")
+    assert len(read_index(path)) == 0
+
+
+def test_refresh_follows_the_data_tree(tmp_path):
+    source = tmp_path / "source_courses" / "EE2023.json"
+    source.parent.mkdir()
+    source.write_text(json.dumps({"source_course": {
+        "code": "EE2023", "name": "Signals", "key_topics": ["Laplace transform"]
+    }}), encoding="utf-8")
+
+    index = SearchIndex()
+    assert refresh(index, tmp_path) == 1
+    assert refresh(index, tmp_path) == 0
+    assert [hit.doc.code for hit in index.search("laplace")] == ["EE2023"]
+
+    source.write_text(json.dumps({"source_course": {
+        "code": "EE2023", "name": "Signals", "key_topics": ["Z transform"]
+    }}), encoding="utf-8")
+    assert refresh(index, tmp_path) == 1
+    assert index.search("laplace") == []
+
+    source.unlink()
+    assert refresh(index, tmp_path) == 1
+    assert len(index) == 0
@@ -0,0 +1,109 @@
+import json
+
+from utils import validation
+from utils.validation import detect_kind, load_valid, validate_document, validate_file
+
+
+def _write(path, doc):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(doc), encoding="utf-8")
+    return path
+
+
+def test_optional_fields_get_defaults():
+    verdict = validate_document({"source_course": {"code": "EE2023", "name": "Signals"}}, "source_course")
+    assert verdict.ok
+    course = verdict.record["source_course"]
+    assert course["credits"] == "unknown"
+    assert course["key_topics"] == []
+    assert course["learning_objectives"] == []
+
+
+def test_defaults_are_not_shared_between_records():
+    a = validate_document({"source_course": {"code": "A", "name": "A"}}, "source_course").record
+    b = validate_document({"source_course": {"code": "B", "name": "B"}}, "source_course").record
+    assert a["source_course"]["key_topics"] is not b["source_course"]["key_topics"]
+
+
+def test_errors_name_the_field():
+    verdict = validate_document(
+        {"source_course": {"code": 12, "key_topics": "x"}}, "source_course"
+    )
+    assert not verdict.ok
+    assert verdict.record is None
+    assert "source_course.code: expected str, got int" in verdict.errors
+    assert "source_course.name: missing" in verdict.errors
+    assert "source_course.key_topics: expected list, got str" in verdict.errors
+
+
+def test_bool_is_not_a_number():
+    verdict = validate_document(
+        {"source_course": "EE2023", "target_courses": [
+            {"course_code": "X", "course_name": "Y", "ects": True}
+        ]},
+        "mapping",
+    )
+    assert verdict.errors == ["target_courses[0].ects: expected int or float or str, got bool"]
+
+
+def test_graph_node_type_is_checked():
+    verdict = validate_document({"nodes": [{"id": "A", "label": "A", "type": "other"}]}, "graph")
+    assert not verdict.ok
+    assert "is not one of" in verdict.errors[0]
+
+
+def test_detect_kind(tmp_path):
+    assert detect_kind(tmp_path / "source_courses" / "EE2023.json") == "source_course"
+    assert detect_kind(tmp_path / "target_courses" / "oulu" / "805305A.json") == "target_course"
+    assert detect_kind(tmp_path / "exports" / "course_mapping_graph.json") == "graph"
+    assert detect_kind(tmp_path / "exports" / "course_mapping_graph_v2.json") == "graph"
+    assert detect_kind(tmp_path / "exports" / "course_mapping_graph.layout.json") is None
+    assert detect_kind(tmp_path / "exports" / "course_mapping_graph.manifest.json") is None
+
+
+def test_validate_file_follows_edits(tmp_path):
+    path = _write(tmp_path / "source_courses" / "EE2023.json", {"source_course": {"code": "EE2023"}})
+    assert not validate_file(path).ok
+
+    _write(path, {"source_course": {"code": "EE2023", "name": "Signals and Systems"}})
+    assert load_valid(path)["source_course"]["name"] == "Signals and Systems"
+
+
+def test_validate_file_reads_each_file_once(tmp_path, monkeypatch):
+    path = _write(tmp_path / "source_courses" / "EE2023.json", {"source_course": {"code": "EE2023", "name": "S"}})
+    reads = []
+    read_bytes = type(path).read_bytes
+
+    def counting_read_bytes(self):
+        reads.append(self)
+        return read_bytes(self)
+
+    monkeypatch.setattr(type(path), "read_bytes", counting_read_bytes)
+    assert validate_file(path).ok
+    assert validate_file(path).ok
+    assert reads == [path]
+
+
+def test_unreadable_and_missing_files(tmp_path):
+    path = tmp_path / "source_courses" / "empty.json"
+    path.parent.mkdir()
+    path.write_text("", encoding="utf-8")
+    verdict = validate_file(path)
+    assert not verdict.ok
+    assert verdict.errors[0].startswith("unreadable JSON")
+
+    assert validate_file(tmp_path / "source_courses" / "gone.json").errors == ["file not found"]
+
+
+def test_validate_tree(tmp_path):
+    _write(tmp_path / "source_courses" / "A.json", {"source_course": {"code": "A", "name": "A"}})
+    _write(tmp_path / "mappings" / "A_to_oulu.json", {"target_courses": []})
+    _write(tmp_path / "exports" / "course_mapping_graph.json", {"nodes": []})
+    _write(tmp_path / "exports" / "course_mapping_graph.manifest.json", {"version": 1})
+
+    results = {(p.name, kind): v.ok for p, kind, v in validation.validate_tree(tmp_path)}
+    assert results == {
+        ("A.json", "source_course"): True,
+        ("A_to_oulu.json", "mapping"): False,
+        ("course_mapping_graph.json", "graph"): True,
+    }
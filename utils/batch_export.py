@@ -0,0 +1,220 @@
+"""
+Headless batch exporter: regenerates every export artifact in one run,
+without Streamlit, e.g. from a nightly cron job.
+
+    python -m utils.batch_export                      # all artifacts into data/exports
+    python -m utils.batch_export --workers 8 --formats svg png
+    python -m utils.batch_export --full               # ignore the export manifest
+
+The graph JSON is built first (incrementally, see utils.export). The
+artifacts derived from it are independent and run on a process pool:
+
+    course_mapping_graph.dot / .svg / .png     whole graph
+    subgraphs/<SOURCE>.json / .dot / .svg      one per source course
+    tables/nodes.csv, edges.csv, past_to_oulu.csv
+
+Every file goes through write_if_changed, so unchanged artifacts keep
+their mtime. Renders need the Graphviz executables; without them the DOT
+files are still written and renders are reported as skipped.
+"""
+
+import argparse
+import csv
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from utils.export import (
+    DATA_DIR,
+    EXPORT_NAME,
+    build_export,
+    export_dot,
+    manifest_path_for,
+    write_export,
+)
+from utils.loaders import dumps_json, write_if_changed
+from utils.render_cache import render_cached
+
+RENDER_FORMATS = ["svg", "png"]
+SUBGRAPH_FORMATS = ["svg"]
+
+
+# ==================================================
+# ARTIFACT TASKS (run in worker processes)
+# ==================================================
+def _write_renders(dot, stem: Path, formats):
+    """Write stem.dot and one render per format; returns (written, skipped)."""
+    written = int(write_if_changed(stem.with_suffix(".dot"), dot.source))
+    skipped = 0
+    for fmt in formats:
+        data = render_cached(dot, fmt)
+        if data is None:
+            skipped += 1
+            continue
+        written += write_if_changed(stem.with_suffix(f".{fmt}"), data)
+    return written, skipped
+
+
+def task_graph_renders(graph, out_dir: Path, formats):
+    return _write_renders(export_dot(graph), out_dir / Path(EXPORT_NAME).stem, formats)
+
+
+def task_subgraph(code, subgraph, out_dir: Path, formats, pretty=True):
+    stem = out_dir / "subgraphs" / code
+    written = write_if_changed(stem.with_suffix(".json"), dumps_json(subgraph, pretty=pretty))
+    rendered, skipped = _write_renders(export_dot(subgraph), stem, formats)
+    return written + rendered, skipped
+
+
+def _csv_text(header, rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buf.getvalue()
+
+
+def task_tables(graph, out_dir: Path):
+    tables_dir = out_dir / "tables"
+    label = {n["id"]: n["label"].replace("\n", " ") for n in graph["nodes"]}
+
+    nodes_csv = _csv_text(
+        ["id", "label", "type", "institution", "provider"],
+        (
+            [n["id"], label[n["id"]], n["type"], n.get("institution") or "", n.get("provider") or ""]
+            for n in graph["nodes"]
+        )
+    )
+    edges_csv = _csv_text(
+        ["from", "to", "relation"],
+        ([e["from"], e["to"], e.get("relation", "")] for e in graph["edges"])
+    )
+
+    # past → NUS → Oulu paths, one row per (past, source, target)
+    evidence = {}
+    targets = {}
+    for e in graph["edges"]:
+        if e.get("relation") == "evidence_for":
+            evidence.setdefault(e["to"], []).append(e["from"])
+        elif e.get("relation") == "maps_to":
+            targets.setdefault(e["from"], []).append(e["to"])
+
+    paths_csv = _csv_text(
+        ["past_id", "past_course", "source_course", "oulu_id", "oulu_course"],
+        (
+            [pid, label.get(pid, pid), src, tid, label.get(tid, tid)]
+            for src, past_ids in evidence.items()
+            for pid in past_ids
+            for tid in targets.get(src, [])
+        )
+    )
+
+    written = 0
+    for name, text in [("nodes.csv", nodes_csv), ("edges.csv", edges_csv), ("past_to_oulu.csv", paths_csv)]:
+        written += write_if_changed(tables_dir / name, text)
+    return written, 0
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+# ==================================================
+# PLANNING
+# ==================================================
+def source_subgraphs(graph):
+    """{source code: export-shaped subgraph of that course and its direct neighbours}."""
+    node_by_id = {n["id"]: n for n in graph["nodes"]}
+    edges_by_source = {}
+    for e in graph["edges"]:
+        for end in (e["from"], e["to"]):
+            if node_by_id.get(end, {}).get("type") == "source":
+                edges_by_source.setdefault(end, []).append(e)
+
+    subgraphs = {}
+    for node in graph["nodes"]:
+        if node["type"] != "source":
+            continue
+        edges = edges_by_source.get(node["id"], [])
+        ids = [node["id"]]
+        for e in edges:
+            for end in (e["from"], e["to"]):
+                if end not in ids and end in node_by_id:
+                    ids.append(end)
+        subgraphs[node["id"]] = {
+            "metadata": {"description": graph["metadata"].get("description"), "source_course": node["id"]},
+            "nodes": [node_by_id[i] for i in ids],
+            "edges": edges
+        }
+    return subgraphs
+
+
+def plan_tasks(graph, out_dir: Path, formats, subgraph_formats, pretty=True):
+    """[(name, function, args)] for every artifact derived from graph."""
+    tasks = [
+        ("graph renders", task_graph_renders, (graph, out_dir, formats)),
+        ("tables", task_tables, (graph, out_dir)),
+    ]
+    for code, subgraph in source_subgraphs(graph).items():
+        tasks.append((f"subgraph {code}", task_subgraph, (code, subgraph, out_dir, subgraph_formats, pretty)))
+    return tasks
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build every course mapping export artifact")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--out", type=Path, default=None, help="output directory (default: <data-dir>/exports)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--formats", nargs="*", default=RENDER_FORMATS, help="render formats for the whole graph")
+    parser.add_argument("--subgraph-formats", nargs="*", default=SUBGRAPH_FORMATS)
+    parser.add_argument("--full", action="store_true", help="ignore the export manifest")
+    parser.add_argument("--compact", action="store_true", help="write compact instead of indented JSON")
+    args = parser.parse_args(argv)
+
+    out_dir = args.out or args.data_dir / "exports"
+    export_path = out_dir / EXPORT_NAME
+    started = time.perf_counter()
+
+    graph, stats = build_export(args.data_dir, manifest_path_for(export_path), full=args.full)
+    graph, changed = write_export(graph, export_path, pretty=not args.compact)
+    print(
+        f"✅ {export_path} ({stats['rebuilt']} fragments rebuilt, {stats['reused']} reused"
+        f"{'' if changed else ', unchanged'}) in {time.perf_counter() - started:.2f}s"
+    )
+
+    tasks = plan_tasks(graph, out_dir, args.formats, args.subgraph_formats, pretty=not args.compact)
+    written = skipped = failed = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(_timed, fn, *fn_args): name for name, fn, fn_args in tasks}
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            name = futures[future]
+            try:
+                (n_written, n_skipped), elapsed = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"[{done}/{len(tasks)}] ❌ {name}: {e}")
+                continue
+            written += n_written
+            skipped += n_skipped
+            print(f"[{done}/{len(tasks)}] ✅ {name} ({n_written} written) {elapsed:.2f}s")
+
+    if skipped:
+        print(f"⚠️ {skipped} renders skipped — Graphviz executables not found")
+    print(
+        f"{'❌' if failed else '✅'} {len(tasks)} tasks, {written} files written, "
+        f"{failed} failed, {time.perf_counter() - started:.2f}s total"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
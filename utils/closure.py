@@ -0,0 +1,134 @@
+"""
+Sparse-matrix reachability over the mapping graph.
+
+Works on a GraphIndex (utils.graph_index): the CSR arrays are wrapped as a
+scipy.sparse adjacency matrix and reachability between node types is
+computed with boolean sparse products, for every start node at once.
+
+    chain_closure(index, ["past", "source", "target"])
+        paths that step through exactly these node types, e.g. the
+        Past → NUS → Oulu collapse, or longer chains such as
+        ["past", "past", "source", "target"].
+
+    reachability(index, "past", "target", max_hops=None)
+        any-length paths (multi-source BFS in matrix form).
+
+Results are cached per GraphIndex, and GraphIndex objects are themselves
+cached per export file hash, so nothing is recomputed until the edge set
+changes.
+"""
+
+import weakref
+
+import numpy as np
+from scipy import sparse
+
+_results = weakref.WeakKeyDictionary()
+
+
+def _cache_for(index):
+    cache = _results.get(index)
+    if cache is None:
+        cache = _results[index] = {}
+    return cache
+
+
+def adjacency(index):
+    """n × n boolean CSR adjacency matrix sharing the index arrays."""
+    cache = _cache_for(index)
+    if "adjacency" not in cache:
+        n = len(index.ids)
+        data = np.ones(len(index.fwd_indices), dtype=bool)
+        cache["adjacency"] = sparse.csr_matrix(
+            (data, index.fwd_indices, index.fwd_indptr), shape=(n, n)
+        )
+    return cache["adjacency"]
+
+
+# ==================================================
+# CLOSURES
+# ==================================================
+def chain_closure(index, chain):
+    """
+    Reachability along a fixed sequence of node types.
+    Returns (row ids, col ids, bool CSR matrix) where [r, c] is True when a
+    path chain[0] → ... → chain[-1] exists from row node r to col node c.
+    """
+    chain = tuple(chain)
+    if len(chain) < 2:
+        raise ValueError("chain needs at least two node types")
+
+    cache = _cache_for(index)
+    key = ("chain", chain)
+    if key not in cache:
+        A = adjacency(index)
+        members = [index.ids_of_type(t) for t in chain]
+
+        result = A[members[0]][:, members[1]]
+        for prev, cur in zip(members[1:], members[2:]):
+            result = result @ A[prev][:, cur]
+
+        cache[key] = (
+            [index.ids[i] for i in members[0]],
+            [index.ids[i] for i in members[-1]],
+            result.tocsr(),
+        )
+    return cache[key]
+
+
+def reachability(index, from_type, to_type, max_hops=None):
+    """
+    Reachability from every from_type node to every to_type node through
+    paths of any node types, up to max_hops edges (unbounded if None).
+    Same return shape as chain_closure.
+    """
+    cache = _cache_for(index)
+    key = ("reach", from_type, to_type, max_hops)
+    if key not in cache:
+        A = adjacency(index)
+        n = len(index.ids)
+        starts = index.ids_of_type(from_type)
+
+        # frontier / reached are k × n boolean matrices, one row per start;
+        # only newly reached nodes are expanded on the next hop
+        frontier = sparse.csr_matrix(
+            (np.ones(len(starts), dtype=bool), (np.arange(len(starts)), starts)),
+            shape=(len(starts), n),
+        )
+        reached = sparse.csr_matrix((len(starts), n), dtype=bool)
+
+        hops = 0
+        while frontier.nnz and (max_hops is None or hops < max_hops):
+            frontier = (frontier @ A) > reached
+            reached = reached + frontier
+            hops += 1
+
+        targets = index.ids_of_type(to_type)
+
+        cache[key] = (
+            [index.ids[i] for i in starts],
+            [index.ids[i] for i in targets],
+            reached[:, targets].tocsr(),
+        )
+    return cache[key]
+
+
+def as_map(result):
+    """{row id: set of col ids} for a chain_closure / reachability result."""
+    row_ids, col_ids, matrix = result
+    matrix = matrix.tocsr()
+    mapping = {}
+    for r, row_id in enumerate(row_ids):
+        cols = matrix.indices[matrix.indptr[r]:matrix.indptr[r + 1]]
+        if len(cols):
+            mapping[row_id] = {col_ids[c] for c in cols}
+    return mapping
+
+
+def chain_closure_map(index, chain):
+    """as_map(chain_closure(...)), cached alongside the matrix."""
+    cache = _cache_for(index)
+    key = ("chain_map", tuple(chain))
+    if key not in cache:
+        cache[key] = as_map(chain_closure(index, chain))
+    return cache[key]
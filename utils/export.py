@@ -0,0 +1,298 @@
+"""
+Incremental build of data/exports/course_mapping_graph.json.
+
+Every source course contributes one fragment of the export: its own node,
+its past-course evidence (data/past_courses/<code>.json) and its Oulu
+targets (the mapping file named in mapping_index.json). A manifest next to
+the export (course_mapping_graph.manifest.json) records a content hash of
+every input file and the fragment built from it. On rebuild, files whose
+(mtime, size) are unchanged are not even read; only fragments whose
+inputs changed are recomputed, and all fragments are spliced back together
+in registry order. A rebuild is therefore still O(sources): every input is
+stat'ed and every fragment spliced. Only changed files are read and hashed,
+and the manifest is rewritten only when it changed.
+
+The export is only rewritten when its content changes (write_export), via
+a temp file and an atomic rename, so readers never see a half-written
+file; metadata.generated_at is the time the content last changed.
+
+    python -m utils.export               # rebuild data/exports/course_mapping_graph.json
+    python -m utils.export --full        # ignore the manifest
+"""
+
+import argparse
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+from graphviz import Digraph
+
+from utils.graph_stream import read_metadata
+from utils.loaders import dumps_json, list_json_files, load_index, load_json, same_content, write_if_changed
+from utils.targets import bare_code
+
+MANIFEST_VERSION = 1
+
+DATA_DIR = Path("data")
+EXPORT_NAME = "course_mapping_graph.json"
+
+DESCRIPTION = "Past → NUS → University of Oulu course mappings"
+
+DOT_GRAPH_ATTR = {
+    "rankdir": "LR",
+    "splines": "ortho",
+    "nodesep": "0.9",
+    "ranksep": "1.3"
+}
+
+COLOR_BY_TYPE = {
+    "past": "#E8F0FE",
+    "source": "#FFF4CC",
+    "target": "#E6F4EA"
+}
+
+
+def export_path_for(data_dir: Path):
+    return data_dir / "exports" / EXPORT_NAME
+
+
+def manifest_path_for(export_path: Path):
+    return export_path.with_suffix(".manifest.json")
+
+
+# ==================================================
+# FRAGMENTS
+# ==================================================
+def build_fragment(src, past_data, mapping_data):
+    """
+    Nodes and edges one source course contributes, in the order the export
+    lists them. past_data / mapping_data may be None.
+    """
+    src_code = src["course_code"]
+    nodes = [{
+        "id": src_code,
+        "label": f"{src_code}\n{src['course_name']}",
+        "type": "source"
+    }]
+    edges = []
+
+    for pc in (past_data or {}).get("past_courses", []):
+        past_id = f"PAST_{src_code}_{pc['course_name']}"
+        nodes.append({
+            "id": past_id,
+            "label": f"{pc['course_name']}\n({pc['institution']})",
+            "type": "past",
+            "institution": pc.get("institution"),
+            "provider": pc.get("provider")
+        })
+        edges.append({"from": past_id, "to": src_code, "relation": "evidence_for"})
+
+    for tgt in (mapping_data or {}).get("target_courses", []):
+        tgt_code = tgt.get("course_code", "UNKNOWN")
+        tgt_name = tgt.get("course_name", "Unknown")
+        nodes.append({
+            "id": tgt_code,
+            "label": f"{tgt_code}\n{tgt_name}",
+            "type": "target"
+        })
+        edges.append({"from": src_code, "to": tgt_code, "relation": "maps_to"})
+
+    return {"nodes": nodes, "edges": edges}
+
+
+def splice(fragments, metadata):
+    """Concatenate fragments into one export; a node id shared by several
+    fragments (e.g. an Oulu course) is kept at its first occurrence."""
+    seen = set()
+    graph = {"metadata": metadata, "nodes": [], "edges": []}
+    for fragment in fragments:
+        for node in fragment["nodes"]:
+            if node["id"] not in seen:
+                seen.add(node["id"])
+                graph["nodes"].append(node)
+        graph["edges"].extend(fragment["edges"])
+    return graph
+
+
+# ==================================================
+# MANIFEST
+# ==================================================
+def _file_hash(path: Path, files, previous):
+    """
+    Content hash of path, or None if it does not exist. The previous
+    manifest's hash is reused while the file's (mtime, size) is unchanged.
+    """
+    if not path.exists():
+        return None
+
+    file_stat = path.stat()
+    stamp = [file_stat.st_mtime_ns, file_stat.st_size]
+    entry = previous.get(str(path))
+    if entry is None or entry["stamp"] != stamp:
+        entry = {
+            "stamp": stamp,
+            "hash": hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+        }
+    files[str(path)] = entry
+    return entry["hash"]
+
+
+def _empty_manifest():
+    return {"version": MANIFEST_VERSION, "files": {}, "fragments": {}}
+
+
+def load_manifest(path: Path):
+    manifest = load_json(path)
+    if not manifest or manifest.get("version") != MANIFEST_VERSION:
+        return _empty_manifest()
+    return manifest
+
+
+def write_manifest(manifest, path: Path):
+    write_if_changed(path, dumps_json(manifest, pretty=False))
+
+
+# ==================================================
+# WRITING
+# ==================================================
+def _dump_export(graph, generated_at, pretty):
+    metadata = {k: v for k, v in graph.get("metadata", {}).items() if k != "generated_at"}
+    graph = {**graph, "metadata": {"generated_at": generated_at, **metadata}}
+    return graph, dumps_json(graph, pretty=pretty)
+
+
+def write_export(graph, path: Path, pretty=True):
+    """
+    Write an export graph to path if its content differs from the file on
+    disk. generated_at is carried over from the current file when nothing
+    else changed and set to now otherwise. pretty=False writes compact
+    JSON. Returns (graph as written or kept, changed).
+    """
+    previous = None
+    if path.exists():
+        try:
+            previous = read_metadata(path).get("generated_at")
+        except ValueError:
+            previous = None
+
+    # compare against the file with the old stamp first, so a real change
+    # is written once, already carrying its new stamp
+    if previous is not None:
+        kept, text = _dump_export(graph, previous, pretty)
+        if same_content(path, text.encode("utf-8")):
+            return kept, False
+
+    stamped, text = _dump_export(graph, datetime.utcnow().isoformat(timespec="seconds") + "Z", pretty)
+    write_if_changed(path, text)
+    return stamped, True
+
+
+# ==================================================
+# BUILD
+# ==================================================
+def build_export(data_dir: Path = DATA_DIR, manifest_path: Path = None, full=False):
+    """
+    Build the export graph, reusing the fragments in manifest_path whose
+    inputs are unchanged. Returns (graph, stats) with stats
+    {"rebuilt": n, "reused": n}; the updated manifest is written back.
+    """
+    manifest_path = manifest_path or manifest_path_for(export_path_for(data_dir))
+    previous = _empty_manifest() if full else load_manifest(manifest_path)
+
+    source_courses = load_index(data_dir / "registries" / "source_courses_index.json")
+    mapping_by_source = {
+        m["source_course"]: m["mapping_file"]
+        for m in load_index(data_dir / "registries" / "mapping_index.json")
+    }
+    # past files may carry a title suffix (ESP2107_Numerical_Methods_...json);
+    # an exact <code>.json sorts first and wins
+    past_by_source = {}
+    for file in list_json_files(data_dir / "past_courses"):
+        past_by_source.setdefault(bare_code(file.stem), file)
+
+    files = {}
+    fragments = {}
+    ordered = []
+    stats = {"rebuilt": 0, "reused": 0}
+
+    for src in source_courses:
+        src_code = src["course_code"]
+        past_file = past_by_source.get(src_code, data_dir / "past_courses" / f"{src_code}.json")
+        mapping_file = mapping_by_source.get(src_code)
+        mapping_path = data_dir / "mappings" / mapping_file if mapping_file else None
+
+        key = hashlib.blake2b(json.dumps([
+            src,
+            _file_hash(past_file, files, previous["files"]),
+            mapping_file,
+            _file_hash(mapping_path, files, previous["files"]) if mapping_path else None
+        ], sort_keys=True, ensure_ascii=False).encode("utf-8"), digest_size=16).hexdigest()
+
+        cached = previous["fragments"].get(src_code)
+        if cached is not None and cached["key"] == key:
+            fragment = cached
+            stats["reused"] += 1
+        else:
+            fragment = {
+                "key": key,
+                **build_fragment(
+                    src,
+                    load_json(past_file) if past_file.exists() else None,
+                    load_json(mapping_path) if mapping_path else None
+                )
+            }
+            stats["rebuilt"] += 1
+
+        fragments[src_code] = fragment
+        ordered.append(fragment)
+
+    # generated_at is stamped by write_export, only when the content changes
+    graph = splice(ordered, {"description": DESCRIPTION})
+
+    manifest = {"version": MANIFEST_VERSION, "files": files, "fragments": fragments}
+    if manifest != previous:
+        write_manifest(manifest, manifest_path)
+    return graph, stats
+
+
+def export_dot(graph):
+    """Digraph of an export graph, coloured by node type."""
+    dot = Digraph(format="png", graph_attr=DOT_GRAPH_ATTR)
+    for node in graph["nodes"]:
+        dot.node(
+            node["id"],
+            node["label"],
+            shape="box",
+            style="filled",
+            fillcolor=COLOR_BY_TYPE.get(node["type"], "#FFFFFF")
+        )
+    for edge in graph["edges"]:
+        dot.edge(edge["from"], edge["to"])
+    return dot
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the course mapping graph export")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--full", action="store_true", help="ignore the manifest and rebuild every fragment")
+    parser.add_argument("--compact", action="store_true", help="write compact instead of indented JSON")
+    args = parser.parse_args(argv)
+
+    export_path = export_path_for(args.data_dir)
+    graph, stats = build_export(args.data_dir, full=args.full)
+
+    graph, changed = write_export(graph, export_path, pretty=not args.compact)
+
+    print(
+        f"✅ {export_path}: {len(graph['nodes'])} nodes, {len(graph['edges'])} edges "
+        f"({stats['rebuilt']} fragments rebuilt, {stats['reused']} reused"
+        f"{'' if changed else ', file unchanged'})"
+    )
+
+
+if __name__ == "__main__":
+    main()
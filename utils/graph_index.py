@@ -0,0 +1,189 @@
+"""
+Integer-ID CSR adjacency index over course_mapping_graph.json.
+
+Node ids are mapped to dense integers once; forward and reverse edges are
+stored as compressed sparse row arrays (indptr / indices), so neighbour
+and reverse queries are array slices instead of per-rerun Python loops
+over the edge list; multi-hop collapses are sparse products on the same
+arrays (utils.closure). Built indexes are cached per export file hash.
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from utils.graph_model import load_graph_model
+
+INDEX_CACHE_MAX = 8
+
+_index_by_hash = {}
+_hash_by_stamp = {}
+_cache_lock = threading.Lock()
+
+
+def _csr(n, src, dst):
+    order = np.lexsort((dst, src))
+    src, dst = src[order], dst[order]
+
+    # drop duplicate (src, dst) pairs — the export may repeat edges
+    if len(src):
+        keep = np.ones(len(src), dtype=bool)
+        keep[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, dst = src[keep], dst[keep]
+
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst.astype(np.int32)
+
+
+class GraphIndex:
+    def __init__(self, graph_data):
+        # nodes are walked more than once; edges may be a one-pass stream
+        nodes = list(graph_data.get("nodes", []))
+        edges = graph_data.get("edges", [])
+
+        self.ids = [n["id"] for n in nodes]
+        self.pos = {node_id: i for i, node_id in enumerate(self.ids)}
+
+        self.type_names = sorted({n["type"] for n in nodes})
+        type_code = {t: i for i, t in enumerate(self.type_names)}
+        self.types = np.array([type_code[n["type"]] for n in nodes], dtype=np.int8)
+
+        pairs = []
+        self.relation = {}
+        for e in edges:
+            if e.get("from") not in self.pos or e.get("to") not in self.pos:
+                continue
+            pair = (self.pos[e["from"]], self.pos[e["to"]])
+            pairs.append(pair)
+            self.relation.setdefault(pair, e.get("relation", ""))
+
+        src = np.array([p[0] for p in pairs], dtype=np.int32)
+        dst = np.array([p[1] for p in pairs], dtype=np.int32)
+
+        n = len(self.ids)
+        self.fwd_indptr, self.fwd_indices = _csr(n, src, dst)
+        self.rev_indptr, self.rev_indices = _csr(n, dst, src)
+
+    # ------------------------------
+    # integer-level queries
+    # ------------------------------
+    def _type_mask(self, idx, node_type):
+        if node_type is None:
+            return idx
+        if node_type not in self.type_names:
+            return idx[:0]
+        return idx[self.types[idx] == self.type_names.index(node_type)]
+
+    def out_ids(self, i, node_type=None):
+        return self._type_mask(self.fwd_indices[self.fwd_indptr[i]:self.fwd_indptr[i + 1]], node_type)
+
+    def in_ids(self, i, node_type=None):
+        return self._type_mask(self.rev_indices[self.rev_indptr[i]:self.rev_indptr[i + 1]], node_type)
+
+    def ids_of_type(self, node_type):
+        return self._type_mask(np.arange(len(self.ids), dtype=np.int32), node_type)
+
+    # ------------------------------
+    # id-level queries
+    # ------------------------------
+    def node_type(self, node_id):
+        return self.type_names[self.types[self.pos[node_id]]]
+
+    def successors(self, node_id, node_type=None):
+        if node_id not in self.pos:
+            return []
+        return [self.ids[j] for j in self.out_ids(self.pos[node_id], node_type)]
+
+    def predecessors(self, node_id, node_type=None):
+        if node_id not in self.pos:
+            return []
+        return [self.ids[j] for j in self.in_ids(self.pos[node_id], node_type)]
+
+    def neighbourhood(self, node_ids, radius, max_nodes=None):
+        """
+        Nodes within `radius` hops of any of node_ids, following edges in
+        both directions, in BFS order. Stops once max_nodes are collected.
+        Returns (ids, truncated).
+        """
+        seen = np.zeros(len(self.ids), dtype=bool)
+        order = []
+        frontier = [self.pos[n] for n in node_ids if n in self.pos]
+
+        for i in frontier:
+            seen[i] = True
+        order.extend(frontier)
+
+        for _ in range(radius):
+            if not frontier:
+                break
+            nbrs = np.concatenate(
+                [self.out_ids(i) for i in frontier] + [self.in_ids(i) for i in frontier]
+            )
+            nbrs = nbrs[~seen[nbrs]]
+            # first-seen order, without duplicates
+            _, first = np.unique(nbrs, return_index=True)
+            frontier = [int(j) for j in nbrs[np.sort(first)]]
+            seen[frontier] = True
+            order.extend(frontier)
+
+        truncated = max_nodes is not None and len(order) > max_nodes
+        if truncated:
+            order = order[:max_nodes]
+        return [self.ids[i] for i in order], truncated
+
+    def edges_among(self, node_ids):
+        """[(from id, to id, relation)] for every edge with both ends in node_ids."""
+        members = np.zeros(len(self.ids), dtype=bool)
+        idx = [self.pos[n] for n in node_ids if n in self.pos]
+        members[idx] = True
+
+        result = []
+        for i in idx:
+            for j in self.out_ids(i):
+                if members[j]:
+                    result.append((self.ids[i], self.ids[j], self.relation[(i, int(j))]))
+        return result
+
+
+# ==================================================
+# CACHED LOADING
+# ==================================================
+def load_graph_index(path: Path):
+    """
+    GraphIndex for an export file, cached per content hash. The hash itself
+    is only recomputed when the file's (mtime, size) changes.
+    """
+    path = Path(path)
+    stat = path.stat()
+    stamp = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    with _cache_lock:
+        digest = _hash_by_stamp.get(stamp)
+        if digest is not None and digest in _index_by_hash:
+            return _index_by_hash[digest]
+
+    hasher = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    digest = hasher.hexdigest()
+
+    with _cache_lock:
+        if len(_hash_by_stamp) > 64:
+            _hash_by_stamp.clear()
+        _hash_by_stamp[stamp] = digest
+        index = _index_by_hash.get(digest)
+        if index is not None:
+            return index
+
+    model = load_graph_model(path)
+    index = GraphIndex(model.as_graph_data() if model is not None else {})
+
+    with _cache_lock:
+        _index_by_hash[digest] = index
+        while len(_index_by_hash) > INDEX_CACHE_MAX:
+            _index_by_hash.pop(next(iter(_index_by_hash)))
+    return index
@@ -0,0 +1,355 @@
+"""
+Compact in-memory model of a course_mapping_graph.json export.
+
+Nodes are numbered 0..n-1: ids and labels are interned strings in two
+lists, node types and edge relations are small integer codes into name
+tables, and edges are parallel int32 arrays (src, dst, relation). Fields
+only some nodes carry (institution, provider, ...) live in a sparse side
+table.
+
+Node and Edge are __slots__ views over those arrays. They answer
+node["label"] / node.get("institution") / edge["from"] like the export
+dicts did, so page code and helpers written against the dicts keep
+working without the model keeping one dict per record.
+"""
+
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from utils.graph_stream import iter_graph, should_stream
+from utils.loaders import codec_for
+
+MODEL_CACHE_MAX = 8
+
+_NODE_KEYS = ("id", "label", "type")
+_MISSING = object()
+
+_models = OrderedDict()
+_models_lock = threading.Lock()
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# ==================================================
+# VIEWS
+# ==================================================
+class Node:
+    __slots__ = ("model", "index")
+
+    def __init__(self, model, index):
+        self.model = model
+        self.index = index
+
+    @property
+    def id(self):
+        return self.model.ids[self.index]
+
+    @property
+    def label(self):
+        return self.model.labels[self.index]
+
+    @property
+    def type(self):
+        return self.model.type_names[self.model.types[self.index]]
+
+    def get(self, key, default=None):
+        if key == "id":
+            return self.id
+        if key == "label":
+            return self.label
+        if key == "type":
+            return self.type
+        return self.model.extra.get(self.index, {}).get(key, default)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def to_dict(self):
+        return {"id": self.id, "label": self.label, "type": self.type,
+                **self.model.extra.get(self.index, {})}
+
+    def __eq__(self, other):
+        return isinstance(other, Node) and other.model is self.model and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.model), self.index))
+
+    def __repr__(self):
+        return f"Node({self.id!r}, type={self.type!r})"
+
+
+class Edge:
+    __slots__ = ("model", "index")
+
+    def __init__(self, model, index):
+        self.model = model
+        self.index = index
+
+    @property
+    def src(self):
+        return self.model.ids[self.model.edge_src[self.index]]
+
+    @property
+    def dst(self):
+        return self.model.ids[self.model.edge_dst[self.index]]
+
+    @property
+    def relation(self):
+        return self.model.relation_names[self.model.edge_rel[self.index]]
+
+    def get(self, key, default=None):
+        if key == "from":
+            return self.src
+        if key == "to":
+            return self.dst
+        if key == "relation":
+            return self.relation
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def to_dict(self):
+        return {"from": self.src, "to": self.dst, "relation": self.relation}
+
+    def __repr__(self):
+        return f"Edge({self.src!r} → {self.dst!r}, {self.relation!r})"
+
+
+# ==================================================
+# MODEL
+# ==================================================
+class GraphModel:
+    __slots__ = (
+        "metadata", "ids", "labels", "pos", "type_names", "types", "extra",
+        "relation_names", "edge_src", "edge_dst", "edge_rel"
+    )
+
+    def __init__(self, nodes, edges, metadata=None):
+        """
+        nodes / edges: iterables of export dicts, each walked once (streams
+        are fine). Edges whose endpoints are not nodes are dropped.
+        """
+        build = _Builder(self)
+        for node in nodes:
+            build.node(node)
+        for edge in edges:
+            build.edge(edge)
+        build.finish(metadata)
+
+    @classmethod
+    def from_graph_data(cls, graph_data):
+        return cls(graph_data.get("nodes", []), graph_data.get("edges", []), graph_data.get("metadata", {}))
+
+    @classmethod
+    def from_stream(cls, path: Path):
+        """Build from a streamed export in one pass; the document is never held whole."""
+        model = cls.__new__(cls)
+        build = _Builder(model)
+        metadata = {}
+        for kind, item in iter_graph(path):
+            if kind == "node":
+                build.node(item)
+            elif kind == "edge":
+                build.edge(item)
+            elif kind == "metadata":
+                metadata = item
+        build.finish(metadata)
+        return model
+
+    # ------------------------------
+    # nodes
+    # ------------------------------
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, node_id):
+        return node_id in self.pos
+
+    def node(self, node_id):
+        return Node(self, self.pos[node_id])
+
+    def label(self, node_id):
+        return self.labels[self.pos[node_id]]
+
+    def node_type(self, node_id):
+        return self.type_names[self.types[self.pos[node_id]]]
+
+    def _indices(self, node_type):
+        if node_type is None:
+            return range(len(self.ids))
+        if node_type not in self.type_names:
+            return []
+        return np.flatnonzero(self.types == self.type_names.index(node_type)).tolist()
+
+    def nodes(self, node_type=None):
+        return [Node(self, i) for i in self._indices(node_type)]
+
+    def node_ids(self, node_type=None):
+        return [self.ids[i] for i in self._indices(node_type)]
+
+    def type_counts(self):
+        counts = np.bincount(self.types, minlength=len(self.type_names))
+        return {t: int(counts[k]) for k, t in enumerate(self.type_names)}
+
+    # ------------------------------
+    # edges
+    # ------------------------------
+    @property
+    def edge_count(self):
+        return len(self.edge_src)
+
+    def edges(self):
+        return (Edge(self, k) for k in range(len(self.edge_src)))
+
+    def edges_among(self, node_ids):
+        """[(from id, to id, relation)] for edges with both ends in node_ids, in export order."""
+        members = np.zeros(len(self.ids), dtype=bool)
+        members[[self.pos[n] for n in node_ids if n in self.pos]] = True
+        keep = np.flatnonzero(members[self.edge_src] & members[self.edge_dst])
+        return [
+            (self.ids[self.edge_src[k]], self.ids[self.edge_dst[k]], self.relation_names[self.edge_rel[k]])
+            for k in keep
+        ]
+
+    def as_graph_data(self):
+        """
+        {"metadata", "nodes", "edges"} with views in place of dicts, for
+        helpers that take export-shaped data (layout, GraphIndex). The
+        edges entry is a one-shot iterator.
+        """
+        return {"metadata": self.metadata, "nodes": self.nodes(), "edges": self.edges()}
+
+
+# ==================================================
+# BUILDING
+# ==================================================
+class _Builder:
+    """
+    Fills a GraphModel's intern tables and arrays one record at a time, so
+    nodes and edges can come from a single pass over a stream. An edge seen
+    before one of its endpoints is kept aside and resolved in finish().
+    """
+
+    def __init__(self, model):
+        self.model = model
+        model.ids = []
+        model.labels = []
+        model.pos = {}
+        model.type_names = []
+        model.extra = {}
+        model.relation_names = []
+
+        self.type_code = {}
+        self.types = array("b")
+        self.relation_code = {}
+        self.src, self.dst, self.rel = array("i"), array("i"), array("h")
+        self.pending = []
+
+    def node(self, node):
+        model = self.model
+        node_id = _intern(node["id"])
+        if node_id in model.pos:
+            return
+        if node["type"] not in self.type_code:
+            self.type_code[node["type"]] = len(model.type_names)
+            model.type_names.append(_intern(node["type"]))
+
+        model.pos[node_id] = len(model.ids)
+        model.ids.append(node_id)
+        model.labels.append(_intern(node.get("label", node_id)))
+        self.types.append(self.type_code[node["type"]])
+
+        rest = {_intern(k): _intern(v) for k, v in node.items() if k not in _NODE_KEYS}
+        if rest:
+            model.extra[len(model.ids) - 1] = rest
+
+    def edge(self, edge):
+        i = self.model.pos.get(edge.get("from"))
+        j = self.model.pos.get(edge.get("to"))
+        relation = edge.get("relation", "")
+        if i is None or j is None:
+            self.pending.append((_intern(edge.get("from")), _intern(edge.get("to")), _intern(relation)))
+            return
+        self._append(i, j, relation)
+
+    def _append(self, i, j, relation):
+        model = self.model
+        if relation not in self.relation_code:
+            self.relation_code[relation] = len(model.relation_names)
+            model.relation_names.append(_intern(relation))
+        self.src.append(i)
+        self.dst.append(j)
+        self.rel.append(self.relation_code[relation])
+
+    def finish(self, metadata):
+        model = self.model
+        for src, dst, relation in self.pending:
+            i = model.pos.get(src)
+            j = model.pos.get(dst)
+            if i is not None and j is not None:
+                self._append(i, j, relation)
+
+        model.metadata = metadata or {}
+        model.types = np.frombuffer(self.types, dtype=np.int8).copy()
+        model.edge_src = np.frombuffer(self.src, dtype=np.int32).copy()
+        model.edge_dst = np.frombuffer(self.dst, dtype=np.int32).copy()
+        model.edge_rel = np.frombuffer(self.rel, dtype=np.int16).copy()
+
+
+# ==================================================
+# CACHED LOADING
+# ==================================================
+def load_graph_model(path: Path):
+    """
+    GraphModel for an export file, cached per process until the file's
+    (mtime, size) changes. Exports large enough to stream are read record
+    by record; smaller ones are decoded whole, without going through the
+    shared JSON cache, and the decoded dict is dropped once the model is
+    built. Returns None if the file is missing or cannot be parsed.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    stat = path.stat()
+    key = str(path.resolve())
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _models_lock:
+        cached = _models.get(key)
+        if cached is not None and cached[0] == stamp:
+            _models.move_to_end(key)
+            return cached[1]
+
+    try:
+        if should_stream(path):
+            model = GraphModel.from_stream(path)
+        else:
+            # decoded outside the shared JSON cache: only the model is kept
+            model = GraphModel.from_graph_data(codec_for(path).loads(path.read_bytes()))
+    except Exception:
+        return None
+
+    with _models_lock:
+        _models[key] = (stamp, model)
+        _models.move_to_end(key)
+        while len(_models) > MODEL_CACHE_MAX:
+            _models.popitem(last=False)
+    return model
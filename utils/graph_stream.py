@@ -0,0 +1,170 @@
+"""
+Streaming reader for course_mapping_graph.json exports.
+
+Walks the {metadata, nodes, edges} document in fixed-size chunks and yields
+one node or edge at a time, so a large export is never held in memory as a
+whole. Filters (node types, id sets) are applied while streaming; records
+that do not match are dropped as soon as they are decoded.
+
+Exports at or above STREAM_MIN_BYTES are read this way by the pages;
+smaller ones are still loaded whole through the shared JSON cache.
+"""
+
+import json
+from pathlib import Path
+
+STREAM_MIN_BYTES = 32 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = set("0123456789.eE+-")
+_decoder = json.JSONDecoder()
+
+
+def should_stream(path: Path):
+    return path.exists() and path.stat().st_size >= STREAM_MIN_BYTES
+
+
+class _Scanner:
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        # drop consumed text so the buffer stays around one chunk
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("unexpected end of graph export")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos} of buffer")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # a number at the end of the buffer may continue in the next chunk:
+            # "1." or "5e" decode as 1 / 5 with the rest left over, so refill
+            # while only number characters follow it
+            if (
+                not self.eof
+                and _is_number(value)
+                and all(c in _NUMBER_CHARS for c in self.buf[end:])
+                and self._fill()
+            ):
+                continue
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def iter_graph(path: Path):
+    """
+    Yield ("metadata", dict), ("node", dict) and ("edge", dict) items in
+    document order. Unknown top-level keys are decoded and skipped.
+    """
+    with Path(path).open("r", encoding="utf-8") as f:
+        scan = _Scanner(f)
+        scan.expect("{")
+
+        if scan.peek() == "}":
+            return
+
+        while True:
+            key = scan.value()
+            scan.expect(":")
+
+            if key in ("nodes", "edges"):
+                kind = key[:-1]
+                scan.expect("[")
+                if scan.peek() == "]":
+                    scan.pos += 1
+                else:
+                    while True:
+                        yield kind, scan.value()
+                        if scan.peek() == ",":
+                            scan.pos += 1
+                            continue
+                        scan.expect("]")
+                        break
+            elif key == "metadata":
+                yield "metadata", scan.value()
+            else:
+                scan.value()
+
+            if scan.peek() == ",":
+                scan.pos += 1
+                continue
+            scan.expect("}")
+            return
+
+
+# ==================================================
+# FILTERED READERS
+# ==================================================
+def read_metadata(path: Path):
+    """The metadata block; stops reading as soon as it has been seen."""
+    for kind, item in iter_graph(path):
+        if kind == "metadata":
+            return item
+    return {}
+
+
+def stream_nodes(path: Path, types=None, ids=None, fields=None):
+    """
+    Nodes whose type is in `types` and id is in `ids` (None = no filter).
+    `fields` trims each node to the listed keys.
+    """
+    types = set(types) if types is not None else None
+    for kind, node in iter_graph(path):
+        if kind != "node":
+            continue
+        if types is not None and node.get("type") not in types:
+            continue
+        if ids is not None and node.get("id") not in ids:
+            continue
+        if fields is not None:
+            node = {k: node[k] for k in fields if k in node}
+        yield node
+
+
+def stream_edges(path: Path, node_ids=None, both_ends=True):
+    """
+    Edges touching node_ids (None = all edges). With both_ends, both
+    endpoints must be in node_ids; otherwise either one is enough.
+    """
+    for kind, edge in iter_graph(path):
+        if kind != "edge":
+            continue
+        if node_ids is not None:
+            inside = (edge.get("from") in node_ids, edge.get("to") in node_ids)
+            if not (all(inside) if both_ends else any(inside)):
+                continue
+        yield edge
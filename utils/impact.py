@@ -0,0 +1,206 @@
+"""
+Reverse index for impact queries: which NUS courses, and which past courses
+behind them, feed a given Oulu course.
+
+    python -m utils.impact 805305A                  # everything that feeds 805305A
+    python -m utils.impact 766202A_Electromagnetism_1 --json
+    python -m utils.impact --list                   # every indexed Oulu course
+
+Targets are keyed by bare code (the part before the first "_"), so
+805305A and 805305A_Regression_ANOVA find the same entries. The index
+remembers what each mapping and past-course file contributed; refresh()
+re-reads only the files whose (mtime, size) changed and swaps out just
+their entries.
+"""
+
+import argparse
+import json
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from utils.loaders import list_json_files
+from utils.targets import bare_code
+from utils.validation import load_valid
+
+DATA_DIR = Path("data")
+
+Link = namedtuple(
+    "Link",
+    ["target_code", "target_name", "source_code", "mapping_file", "mapping_type", "justification"]
+)
+
+
+def _stamp(path: Path):
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ImpactIndex:
+    def __init__(self, data_dir: Path = DATA_DIR):
+        self.mappings_dir = data_dir / "mappings"
+        self.past_dir = data_dir / "past_courses"
+
+        self.by_target = {}         # bare target code → [Link]
+        self.past_by_source = {}    # source code → [past course record]
+        self._mapping_links = {}    # mapping file name → [Link] it contributed
+        self._mapping_stamps = {}   # file name → (mtime, size) when last read
+        self._past_stamps = {}
+        self._past_keys = {}        # past-course file name → source code it is stored under
+        self._lock = threading.Lock()
+        self.refresh()
+
+    # ------------------------------
+    # incremental maintenance
+    # ------------------------------
+    def refresh(self):
+        """Re-read changed, added and removed files; returns how many were updated."""
+        with self._lock:
+            updated = self._sync(self.mappings_dir, self._mapping_stamps, self._update_mapping, self._drop_mapping)
+            updated += self._sync(self.past_dir, self._past_stamps, self._update_past, self._drop_past)
+        return updated
+
+    @staticmethod
+    def _sync(dir_path, stamps, update, drop):
+        current = {file.name: _stamp(file) for file in list_json_files(dir_path)}
+        updated = 0
+        for name in set(stamps) - set(current):
+            drop(name)
+            updated += 1
+        for name, stamp in current.items():
+            if stamps.get(name) != stamp:
+                update(name, stamp)
+                updated += 1
+        return updated
+
+    def _update_mapping(self, name, stamp):
+        self._drop_mapping(name)
+        mapping = load_valid(self.mappings_dir / name, "mapping")
+
+        links = []
+        if mapping is not None:
+            for target in mapping["target_courses"]:
+                links.append(Link(
+                    target["course_code"],
+                    target["course_name"],
+                    mapping["source_course"],
+                    name,
+                    target["mapping_type"],
+                    target["justification"]
+                ))
+
+        for link in links:
+            self.by_target.setdefault(bare_code(link.target_code), []).append(link)
+        self._mapping_links[name] = links
+        self._mapping_stamps[name] = stamp
+
+    def _drop_mapping(self, name):
+        self._mapping_stamps.pop(name, None)
+        links = self._mapping_links.pop(name, [])
+        for key in {bare_code(link.target_code) for link in links}:
+            remaining = [link for link in self.by_target[key] if link.mapping_file != name]
+            if remaining:
+                self.by_target[key] = remaining
+            else:
+                del self.by_target[key]
+
+    # files may carry a title suffix (ESP2107_Numerical_Methods_and_Statistics.json),
+    # so evidence is keyed by the course code the file declares
+    def _update_past(self, name, stamp):
+        self._drop_past(name)
+        record = load_valid(self.past_dir / name, "past_courses")
+        key = (record["nus_course_code"] if record else "") or bare_code(Path(name).stem)
+        self.past_by_source[key] = record["past_courses"] if record else []
+        self._past_keys[name] = key
+        self._past_stamps[name] = stamp
+
+    def _drop_past(self, name):
+        self._past_stamps.pop(name, None)
+        key = self._past_keys.pop(name, None)
+        if key is not None:
+            self.past_by_source.pop(key, None)
+
+    # ------------------------------
+    # queries
+    # ------------------------------
+    def targets(self):
+        """{bare code: course name} of every Oulu course some mapping lists."""
+        with self._lock:
+            return {code: links[0].target_name for code, links in sorted(self.by_target.items())}
+
+    def links(self, target_code):
+        with self._lock:
+            return list(self.by_target.get(bare_code(target_code), []))
+
+    def impact(self, target_code):
+        """
+        One dict per mapping entry that lists target_code: the Link fields
+        plus the past courses recorded as evidence for its source course.
+        """
+        with self._lock:
+            return [
+                {**link._asdict(), "past_courses": list(self.past_by_source.get(link.source_code, []))}
+                for link in self.by_target.get(bare_code(target_code), [])
+            ]
+
+
+# ==================================================
+# CACHED LOADING
+# ==================================================
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def load_impact_index(data_dir: Path = DATA_DIR):
+    """Shared ImpactIndex for data_dir, refreshed incrementally on every call."""
+    key = str(Path(data_dir).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = ImpactIndex(Path(data_dir))
+            return index
+    index.refresh()
+    return index
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Which NUS and past courses feed an Oulu course")
+    parser.add_argument("codes", nargs="*", help="Oulu course codes (bare or suffixed)")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--list", action="store_true", help="list every indexed Oulu course")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args(argv)
+
+    index = load_impact_index(args.data_dir)
+
+    if args.list or not args.codes:
+        for code, name in index.targets().items():
+            print(f"{code}  {name}")
+        return 0
+
+    results = {code: index.impact(code) for code in args.codes}
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return 0 if all(results.values()) else 1
+
+    missing = 0
+    for code, entries in results.items():
+        if not entries:
+            missing += 1
+            print(f"⚠️ No mapping lists {code}")
+            continue
+        print(f"✅ {code} — {entries[0]['target_name']}: {len(entries)} mapping entries")
+        for entry in entries:
+            print(f"  {entry['source_code']} [{entry['mapping_type'] or 'unspecified'}] ({entry['mapping_file']})")
+            if entry["justification"]:
+                print(f"      {entry['justification']}")
+            for pc in entry["past_courses"]:
+                print(f"      ← {pc['course_name']} ({pc['institution']})")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,225 @@
+"""
+Diff-only persistence for st.data_editor tables.
+
+Instead of re-serialising a whole JSON store on every save, pages compute
+the rows that actually changed (diff_rows) and append just those to a
+JSON-lines journal next to the base file. Reads fold the journal over the
+base (load_journaled); once the journal grows past COMPACT_MAX_BYTES the
+next save folds it back into the base file and starts a fresh journal.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from utils.loaders import read_json_cached, write_if_changed
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+COMPACT_MAX_BYTES = 256 * 1024
+COMPACT_LOCK_STALE_SECONDS = 60
+
+
+def journal_path_for(base_path: Path):
+    return base_path.with_suffix(".journal.jsonl")
+
+
+def _folding_path_for(base_path: Path):
+    return base_path.with_suffix(".journal.compacting")
+
+
+def _lock_path_for(base_path: Path):
+    return base_path.with_suffix(".journal.lock")
+
+
+def _norm(value):
+    # data_editor hands back None / NaN for cleared cells
+    if value is None or value != value:
+        return ""
+    return value
+
+
+# ==================================================
+# DIFF
+# ==================================================
+def diff_rows(before_df, after_df, key, columns):
+    """
+    Rows of after_df whose `columns` differ from the row with the same
+    `key` in before_df (or that are new). Returns [(key, {col: value})].
+    """
+    before = {
+        r[key]: r
+        for r in before_df.to_dict("records")
+    }
+
+    changed = []
+    for r in after_df.to_dict("records"):
+        old = before.get(r[key], {})
+        value = {c: _norm(r.get(c)) for c in columns}
+        if any(value[c] != _norm(old.get(c)) for c in columns):
+            changed.append((r[key], value))
+    return changed
+
+
+# ==================================================
+# JOURNAL
+# ==================================================
+def append_journal(journal_path: Path, entries):
+    """Append (key, value) entries; one JSON object per line."""
+    if not entries:
+        return
+    lines = "".join(
+        json.dumps({"key": k, "value": v}, ensure_ascii=False) + "\n"
+        for k, v in entries
+    )
+    while True:
+        with journal_path.open("a", encoding="utf-8") as f:
+            _lock_file(f)
+            # compaction may have moved this file aside while we waited for
+            # the lock; appending to it then would lose the entries
+            if not _same_file(f, journal_path):
+                continue
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+            return
+
+
+def _lock_file(f):
+    """Exclusive advisory lock, released when f is closed (POSIX only)."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _same_file(f, path: Path):
+    try:
+        return os.path.samestat(os.fstat(f.fileno()), os.stat(path))
+    except FileNotFoundError:
+        return False
+
+
+def _apply(db, key, value):
+    old = db.get(key)
+    if isinstance(old, dict) and isinstance(value, dict):
+        db[key] = {**old, **value}
+    else:
+        db[key] = value
+
+
+def replay_journal(db, journal_path: Path):
+    try:
+        f = journal_path.open("r", encoding="utf-8")
+    except FileNotFoundError:
+        return db
+    with f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # torn last line from an interrupted append
+                continue
+            _apply(db, entry["key"], entry["value"])
+    return db
+
+
+def _files_state(base_path: Path):
+    """Which base / folding / journal files exist right now (by inode and, for the base, content stamp)."""
+    state = []
+    for path in (base_path, _folding_path_for(base_path), journal_path_for(base_path)):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            state.append(None)
+            continue
+        state.append((st.st_ino, st.st_mtime_ns, st.st_size) if path == base_path else st.st_ino)
+    return state
+
+
+def load_journaled(base_path: Path):
+    """Base JSON dict with its journal folded in (a fresh, mutable dict)."""
+    while True:
+        before = _files_state(base_path)
+        db = dict(read_json_cached(base_path)) if before[0] else {}
+        # a journal left mid-compaction holds entries older than the live one
+        replay_journal(db, _folding_path_for(base_path))
+        replay_journal(db, journal_path_for(base_path))
+        # a compaction that moved files under us may have hidden entries; read again
+        if _files_state(base_path) == before:
+            return db
+
+
+# ==================================================
+# COMPACTION
+# ==================================================
+def _try_lock(lock_path: Path):
+    """Create lock_path exclusively; a lock left by a crashed compaction expires."""
+    try:
+        os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        pass
+    try:
+        if time.time() - lock_path.stat().st_mtime <= COMPACT_LOCK_STALE_SECONDS:
+            return False
+        lock_path.unlink(missing_ok=True)
+    except FileNotFoundError:
+        # released just now: try once more, never unlink what may be a new lock
+        pass
+    try:
+        os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        return False
+
+
+def compact(base_path: Path):
+    """
+    Fold the journal into the base file. The journal is moved aside first,
+    so appends from other sessions during compaction go to a new journal.
+    Only one session compacts at a time; the others return at once and
+    their entries are folded by the next compaction. Returns True if this
+    call did the compaction.
+    """
+    lock_path = _lock_path_for(base_path)
+    if not _try_lock(lock_path):
+        return False
+
+    try:
+        journal_path = journal_path_for(base_path)
+        folding = _folding_path_for(base_path)
+
+        # A leftover from an interrupted compaction is folded first; the live
+        # journal then waits for the next compaction.
+        if not folding.exists():
+            if not journal_path.exists():
+                return True
+            journal_path.replace(folding)
+
+        # waits for appends still writing to the moved-aside journal
+        with folding.open("a", encoding="utf-8") as held:
+            _lock_file(held)
+            db = dict(read_json_cached(base_path)) if base_path.exists() else {}
+            replay_journal(db, folding)
+
+            write_if_changed(base_path, json.dumps(db, indent=2, ensure_ascii=False))
+            folding.unlink(missing_ok=True)
+        return True
+    finally:
+        lock_path.unlink(missing_ok=True)
+
+
+def save_changes(base_path: Path, entries):
+    """Append entries to the journal and compact if it has grown too large."""
+    journal_path = journal_path_for(base_path)
+    append_journal(journal_path, entries)
+    try:
+        size = journal_path.stat().st_size
+    except FileNotFoundError:
+        # another session is compacting it right now
+        return
+    if size > COMPACT_MAX_BYTES:
+        compact(base_path)
@@ -0,0 +1,240 @@
+"""
+Pre-computed layout for course_mapping_graph.json exports.
+
+The export step lays the graph out once with Graphviz and stores node
+positions and edge spline points in a sidecar file next to the export
+(course_mapping_graph.layout.json). Viewer pages then draw with the nodes
+pinned at those coordinates (neato, pos="x,y!"), so no layout work is done
+per rerun. Nodes added to the export after the last full layout are placed
+incrementally in their type's column; existing nodes never move.
+
+    python -m utils.layout data/exports/course_mapping_graph.json          # update
+    python -m utils.layout data/exports/course_mapping_graph.json --full   # full re-layout
+"""
+
+import argparse
+import json
+import statistics
+from pathlib import Path
+
+from graphviz import Digraph, ExecutableNotFound
+
+from utils.loaders import dumps_json, load_json, read_json_cached, write_if_changed
+
+LAYOUT_GRAPH_ATTR = {
+    "rankdir": "LR",
+    "splines": "ortho",
+    "nodesep": "0.9",
+    "ranksep": "1.3"
+}
+
+# neato with pinned positions given in points: no layout pass is run
+PINNED_GRAPH_ATTR = {
+    "inputscale": "72",
+    "splines": "line",
+    "overlap": "true"
+}
+
+NEW_NODE_SPACING = 54
+NEW_COLUMN_SPACING = 220
+
+
+def layout_path_for(graph_path: Path):
+    return graph_path.with_suffix(".layout.json")
+
+
+def _xy(text):
+    x, y = text.rstrip("!").split(",")[:2]
+    return [round(float(x), 2), round(float(y), 2)]
+
+
+# ==================================================
+# FULL LAYOUT
+# ==================================================
+def compute_layout(graph_data):
+    """
+    Run Graphviz once over the whole graph and return the layout block:
+    {"engine", "bb", "nodes": {id: {"x","y","w","h","type"}}, "edges": [...]}.
+    Returns None if the Graphviz executables are not installed.
+    """
+    node_type = {n["id"]: n["type"] for n in graph_data.get("nodes", [])}
+
+    dot = Digraph(graph_attr=LAYOUT_GRAPH_ATTR)
+    for node in graph_data.get("nodes", []):
+        dot.node(node["id"], node["label"], shape="box")
+    for edge in graph_data.get("edges", []):
+        if edge.get("from") in node_type and edge.get("to") in node_type:
+            dot.edge(edge["from"], edge["to"], label=edge.get("relation", ""))
+
+    try:
+        rendered = json.loads(dot.pipe(format="json"))
+    except ExecutableNotFound:
+        return None
+
+    by_gvid = {}
+    nodes = {}
+    for obj in rendered.get("objects", []):
+        if "pos" not in obj:
+            continue
+        by_gvid[obj["_gvid"]] = obj["name"]
+        x, y = _xy(obj["pos"])
+        nodes[obj["name"]] = {
+            "x": x,
+            "y": y,
+            "w": round(float(obj.get("width", 0)) * 72, 2),
+            "h": round(float(obj.get("height", 0)) * 72, 2),
+            "type": node_type.get(obj["name"])
+        }
+
+    edges = []
+    for e in rendered.get("edges", []):
+        points = []
+        end = None
+        for token in e.get("pos", "").split():
+            if token.startswith("e,"):
+                end = _xy(token[2:])
+            elif not token.startswith("s,"):
+                points.append(_xy(token))
+        edges.append({
+            "from": by_gvid[e["tail"]],
+            "to": by_gvid[e["head"]],
+            "points": points,
+            "end": end
+        })
+
+    return {
+        "engine": "dot",
+        "bb": [float(v) for v in rendered.get("bb", "0,0,0,0").split(",")],
+        "nodes": nodes,
+        "edges": edges
+    }
+
+
+# ==================================================
+# INCREMENTAL LAYOUT
+# ==================================================
+def update_layout(layout, graph_data):
+    """
+    Bring a stored layout in line with graph_data without moving any node
+    that already has a position. Returns layout itself when nothing changed,
+    otherwise a new layout dict.
+    """
+    node_ids = [n["id"] for n in graph_data.get("nodes", [])]
+    keep = set(node_ids)
+    edge_pairs = {
+        (e["from"], e["to"])
+        for e in graph_data.get("edges", [])
+        if e.get("from") in keep and e.get("to") in keep
+    }
+    placed = layout["nodes"]
+
+    new_nodes = [n for n in graph_data.get("nodes", []) if n["id"] not in placed]
+    laid_pairs = {(e["from"], e["to"]) for e in layout["edges"]}
+    if not new_nodes and len(placed) == len(node_ids) and laid_pairs == edge_pairs:
+        return layout
+
+    nodes = {nid: pos for nid, pos in placed.items() if nid in keep}
+
+    # new nodes go at the bottom of their type's column
+    columns = {}
+    for pos in nodes.values():
+        columns.setdefault(pos["type"], []).append(pos)
+
+    for node in new_nodes:
+        column = columns.setdefault(node["type"], [])
+        if column:
+            x = statistics.median(p["x"] for p in column)
+            y = min(p["y"] for p in column) - NEW_NODE_SPACING
+        else:
+            x = max((p["x"] for p in nodes.values()), default=0) + NEW_COLUMN_SPACING
+            y = max((p["y"] for p in nodes.values()), default=0)
+        pos = {"x": x, "y": y, "w": 0, "h": 0, "type": node["type"], "incremental": True}
+        nodes[node["id"]] = pos
+        column.append(pos)
+
+    edges = [e for e in layout["edges"] if (e["from"], e["to"]) in edge_pairs]
+    for src, tgt in sorted(edge_pairs - laid_pairs):
+        edges.append({
+            "from": src,
+            "to": tgt,
+            "points": [
+                [nodes[src]["x"], nodes[src]["y"]],
+                [nodes[tgt]["x"], nodes[tgt]["y"]]
+            ],
+            "end": None
+        })
+
+    xs = [p["x"] for p in nodes.values()] or [0]
+    ys = [p["y"] for p in nodes.values()] or [0]
+    return {
+        **layout,
+        "bb": [min(xs), min(ys), max(xs), max(ys)],
+        "nodes": nodes,
+        "edges": edges
+    }
+
+
+# ==================================================
+# SIDECAR
+# ==================================================
+def write_layout(graph_path: Path, graph_data, full=False):
+    """
+    Create or update the layout sidecar for an export. A full Graphviz
+    layout runs when requested or when no sidecar exists yet; otherwise
+    only new nodes are placed. Returns the layout (None without Graphviz).
+    """
+    sidecar = layout_path_for(graph_path)
+    previous = None if full else load_json(sidecar)
+
+    if previous is None:
+        layout = compute_layout(graph_data)
+    else:
+        layout = update_layout(previous, graph_data)
+        if layout is previous:
+            return layout
+
+    if layout is None:
+        return None
+
+    write_if_changed(sidecar, dumps_json(layout, pretty=False))
+    return layout
+
+
+def load_layout(graph_path: Path, graph_data):
+    """
+    Stored layout for an export, topped up in memory with any nodes added
+    since it was written. None when no sidecar exists.
+    """
+    sidecar = layout_path_for(graph_path)
+    if not sidecar.exists():
+        return None
+    try:
+        layout = read_json_cached(sidecar)
+    except Exception:
+        return None
+    return update_layout(layout, graph_data)
+
+
+def pinned_attrs(layout, node_id):
+    """Node attributes pinning node_id at its stored position ({} if unknown)."""
+    if not layout or node_id not in layout["nodes"]:
+        return {}
+    pos = layout["nodes"][node_id]
+    return {"pos": f"{pos['x']},{pos['y']}!"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lay out a course mapping graph export")
+    parser.add_argument("graph", type=Path, nargs="?", default=Path("data/exports/course_mapping_graph.json"))
+    parser.add_argument("--full", action="store_true", help="discard stored positions and re-run Graphviz")
+    args = parser.parse_args(argv)
+
+    layout = write_layout(args.graph, load_json(args.graph) or {}, full=args.full)
+    if layout is None:
+        print("❌ Graphviz executables not found — layout not written")
+        return
+    print(f"✅ Layout for {len(layout['nodes'])} nodes written to {layout_path_for(args.graph)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,269 @@
+import hashlib
 import json
+import os
+import stat
+import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# ==================================================
+# CODECS
+# ==================================================
+# All reads and writes go through a Codec. "json" (stdlib) is always
+# available; "orjson" (faster JSON, same text format) and "msgpack" (binary,
+# *.msgpack files) are used when installed. DEFAULT_CODEC is the fastest
+# available JSON codec.
+class Codec:
+    def __init__(self, name, suffix, binary, loads, dumps):
+        self.name = name
+        self.suffix = suffix
+        self.binary = binary
+        self._loads = loads
+        self._dumps = dumps
+
+    def loads(self, data: bytes):
+        return self._loads(data)
+
+    def dumps(self, obj, pretty=False) -> bytes:
+        """Encoded obj; pretty = 2-space indented (text codecs only)."""
+        return self._dumps(obj, pretty)
+
+    def __repr__(self):
+        return f"Codec({self.name!r})"
+
+
+def _json_dumps(obj, pretty):
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+CODECS = {"json": Codec("json", ".json", False, json.loads, _json_dumps)}
+
+if orjson is not None:
+    def _orjson_loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN / Infinity and big integers are valid for stdlib json only;
+            # genuinely broken files raise the stdlib error from here.
+            return json.loads(data)
+
+    def _orjson_dumps(obj, pretty):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    CODECS["orjson"] = Codec("orjson", ".json", False, _orjson_loads, _orjson_dumps)
+
+if msgpack is not None:
+    CODECS["msgpack"] = Codec(
+        "msgpack", ".msgpack", True,
+        lambda data: msgpack.unpackb(data, strict_map_key=False),
+        lambda obj, pretty: msgpack.packb(obj)
+    )
+
+DEFAULT_CODEC = CODECS["orjson"] if "orjson" in CODECS else CODECS["json"]
+
+
+def get_codec(name=None):
+    """Codec by name; None gives DEFAULT_CODEC. Raises KeyError if not installed."""
+    return DEFAULT_CODEC if name is None else CODECS[name]
+
+
+def codec_for(path: Path):
+    """msgpack for *.msgpack files, DEFAULT_CODEC otherwise."""
+    if Path(path).suffix == ".msgpack":
+        return CODECS["msgpack"]
+    return DEFAULT_CODEC
+
+
+def dumps_json(obj, pretty=True, codec=None):
+    """obj as JSON text (str); compact when pretty is False."""
+    return get_codec(codec).dumps(obj, pretty).decode("utf-8")
+
+
+# ==================================================
+# ATOMIC WRITES
+# ==================================================
+def _file_digest(path: Path):
+    hasher = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.digest()
+
+
+# mode for files write_if_changed creates; the process umask is not read,
+# since os.umask can only be read by changing it for every thread
+NEW_FILE_MODE = 0o644
+
+
+def _file_mode(path: Path):
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        return NEW_FILE_MODE
+
+
+def same_content(path: Path, data: bytes):
+    """True if path exists and holds exactly data (size check first, then hash)."""
+    return (
+        path.exists()
+        and path.stat().st_size == len(data)
+        and _file_digest(path) == hashlib.blake2b(data, digest_size=16).digest()
+    )
+
+
+def write_if_changed(path: Path, content):
+    """
+    Write content (str or bytes) to path unless the file already holds
+    exactly that content.
+    The new content goes to a temp file in the same directory, is fsynced
+    and then renamed over path, so readers see either the old or the new
+    file, never a partial one. Returns True if the file was written.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    if same_content(path, data):
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600; keep the existing file's mode, or
+        # NEW_FILE_MODE for a new file
+        os.chmod(tmp_name, _file_mode(path))
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return True
+
+
+# ==================================================
+# DECODED-FILE CACHE
+# ==================================================
+# Streamlit re-executes every page on each widget interaction, so the same
+# JSON files are read over and over. Decoded documents are kept in a bounded
+# LRU keyed on (path, mtime, size): an unchanged file is never decoded twice,
+# and an edited file is picked up on the next rerun. The LRU is bounded both
+# by entry count and by CACHE_MAX_BYTES, measured as the on-disk size of the
+# cached files (a proxy for the decoded size); a file larger than the whole
+# budget is decoded but not kept.
+#
+# Cached documents are shared by every caller, rerun and session without
+# copying: callers must not mutate them, and should copy (e.g. dict(doc) or
+# copy.deepcopy) before editing.
+CACHE_MAX_ENTRIES = 4096
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_cache_bytes = 0
+
+_dir_cache = {}
+
+
+def _stat_key(path: Path):
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_json_cached(path: Path):
+    """
+    Decode a JSON file through the shared cache.
+
+    Raises the same errors as json.loads / Path.read_bytes, so callers that
+    need strict behaviour (e.g. schema checks) can rely on it. *.msgpack
+    files are decoded with the msgpack codec (KeyError if not installed). The returned
+    object is shared between reruns and sessions and must not be mutated;
+    copy it first if it needs editing.
+    """
+    path = Path(path)
+    cache_key = str(path.resolve())
+    stamp = _stat_key(path)
+
+    global _cache_bytes
+
+    with _cache_lock:
+        entry = _cache.get(cache_key)
+        if entry is not None and entry[0] == stamp:
+            _cache.move_to_end(cache_key)
+            _cache_stats["hits"] += 1
+            cached = entry[1]
+            if isinstance(cached, Exception):
+                raise cached.with_traceback(None)
+            return cached
+        _cache_stats["misses"] += 1
+
+    try:
+        result = codec_for(path).loads(path.read_bytes())
+    except (OSError, ValueError) as e:
+        result = e
+
+    size = stamp[1]
+    with _cache_lock:
+        old = _cache.pop(cache_key, None)
+        if old is not None:
+            _cache_bytes -= old[0][1]
+        if size <= CACHE_MAX_BYTES:
+            _cache[cache_key] = (stamp, result)
+            _cache_bytes += size
+        while _cache and (len(_cache) > CACHE_MAX_ENTRIES or _cache_bytes > CACHE_MAX_BYTES):
+            _, (evicted_stamp, _) = _cache.popitem(last=False)
+            _cache_bytes -= evicted_stamp[1]
+            _cache_stats["evictions"] += 1
+
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def cache_info():
+    with _cache_lock:
+        return {
+            **_cache_stats,
+            "size": len(_cache),
+            "max_entries": CACHE_MAX_ENTRIES,
+            "bytes": _cache_bytes,
+            "max_bytes": CACHE_MAX_BYTES,
+        }
+
+
+def clear_cache():
+    global _cache_bytes
+
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
+        _dir_cache.clear()
+        for k in _cache_stats:
+            _cache_stats[k] = 0
+
+
+# ==================================================
+# LOADERS
+# ==================================================
 def load_json(path: Path):
     if not path.exists():
         return None
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return read_json_cached(path)
     except Exception:
         return None
 
@@ -17,6 +274,20 @@ def load_index(index_path: Path):
 
 
 def list_json_files(dir_path: Path):
+    """
+    Sorted *.json files in dir_path. The listing is reused until the
+    directory's mtime changes (files added, removed or renamed).
+    """
     if not dir_path.exists():
         return []
-    return sorted(dir_path.glob("*.json"))
+
+    cache_key = str(Path(dir_path).resolve())
+    mtime = dir_path.stat().st_mtime_ns
+
+    cached = _dir_cache.get(cache_key)
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1])
+
+    files = sorted(dir_path.glob("*.json"))
+    _dir_cache[cache_key] = (mtime, files)
+    return list(files)
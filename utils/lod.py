@@ -0,0 +1,101 @@
+"""
+Level-of-detail grouping of past-course nodes.
+
+When a view would draw more past courses than LOD_THRESHOLD, they are
+folded into one super-node per institution (or provider). Edges are
+re-pointed at the super-nodes and merged, with the number of merged edges
+shown as the edge label. Groups the user drills into are drawn member by
+member again, so DOT size stays roughly constant as the catalog grows.
+"""
+
+from collections import Counter
+
+LOD_THRESHOLD = 40
+GROUP_FIELDS = ["institution", "provider"]
+
+UNKNOWN_GROUP = "Unknown"
+
+
+def super_node_id(group):
+    return f"GROUP__{group.replace(':', '_')}"
+
+
+def label_institution(label):
+    """
+    Institution from a past-course label ending in "(Institution)", as the
+    exports write them. Handles nested parentheses such as
+    "Signals (École Polytechnique Fédérale de Lausanne (EPFL))".
+    """
+    label = label.rstrip()
+    if not label.endswith(")"):
+        return None
+
+    depth = 0
+    for i in range(len(label) - 1, -1, -1):
+        if label[i] == ")":
+            depth += 1
+        elif label[i] == "(":
+            depth -= 1
+            if depth == 0:
+                return label[i + 1:-1].strip() or None
+    return None
+
+
+def provider_by_institution(past_by_code):
+    """{institution: provider} from data/past_courses/*.json documents."""
+    providers = {}
+    for past_data in past_by_code.values():
+        if not isinstance(past_data, dict):
+            continue
+        for pc in past_data.get("past_courses", []):
+            if pc.get("institution") and pc.get("provider"):
+                providers.setdefault(pc["institution"], pc["provider"])
+    return providers
+
+
+def past_group(node, field, providers):
+    """Group name of an export past node for field "institution" / "provider"."""
+    institution = node.get("institution") or label_institution(node.get("label", ""))
+    if field == "institution":
+        return institution or UNKNOWN_GROUP
+    return node.get("provider") or providers.get(institution) or UNKNOWN_GROUP
+
+
+# ==================================================
+# AGGREGATION
+# ==================================================
+def aggregate(group_of, threshold=LOD_THRESHOLD, expanded=()):
+    """
+    group_of: {node id: group name}.
+
+    Returns (rep, groups): rep maps every node id to the id it is drawn as
+    (itself, or its group's super-node id); groups maps super-node ids to
+    {"name", "members"} for the groups actually collapsed. Nothing is
+    collapsed while len(group_of) <= threshold.
+    """
+    if len(group_of) <= threshold:
+        return {nid: nid for nid in group_of}, {}
+
+    expanded = set(expanded)
+    rep = {}
+    groups = {}
+    for nid, group in group_of.items():
+        if group in expanded:
+            rep[nid] = nid
+            continue
+        sid = super_node_id(group)
+        rep[nid] = sid
+        groups.setdefault(sid, {"name": group, "members": []})["members"].append(nid)
+    return rep, groups
+
+
+def merge_edges(edges, rep):
+    """
+    edges: iterable of (from id, to id, kind). Endpoints are mapped through
+    rep (ids missing from rep are kept) and identical edges are merged.
+    Returns [(from, to, kind, count)] in first-seen order.
+    """
+    counts = Counter()
+    for src, tgt, kind in edges:
+        counts[(rep.get(src, src), rep.get(tgt, tgt), kind)] += 1
+    return [(src, tgt, kind, n) for (src, tgt, kind), n in counts.items()]
@@ -0,0 +1,197 @@
+"""
+SQLite store for Past → Oulu mapping notes and course links.
+
+Optional backend for pages/03_Mapping_Oulu.py. Rows are upserted
+individually, keyed on (past_id, target_id) for notes and course_id for
+links, so a save only touches the rows it writes and concurrent sessions no
+longer overwrite each other's edits. The database runs in WAL mode so
+readers never block the writer.
+
+One-time migration from the existing JSON files:
+
+    python -m utils.notes_store            # data/exports/*.json → course_mapping.sqlite3
+"""
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+from utils import journal
+
+EXPORT_DIR = Path("data/exports")
+DB_NAME = "course_mapping.sqlite3"
+NOTES_NAME = "course_notes.json"
+LINKS_NAME = "course_links.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    past_id     TEXT NOT NULL,
+    target_id   TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    notes       TEXT NOT NULL DEFAULT '',
+    url         TEXT NOT NULL DEFAULT '',
+    updated_at  TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now')),
+    PRIMARY KEY (past_id, target_id)
+);
+
+CREATE TABLE IF NOT EXISTS links (
+    course_id  TEXT PRIMARY KEY,
+    url        TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+);
+"""
+
+
+# ==================================================
+# KEYS & VALUES
+# ==================================================
+def note_key(past_id, target_id):
+    return f"{past_id}__{target_id}"
+
+
+def split_note_key(key):
+    past_id, _, target_id = key.partition("__")
+    return past_id, target_id
+
+
+def _text(value):
+    # data_editor hands back None / NaN for cleared cells
+    if value is None or value != value:
+        return ""
+    return str(value)
+
+
+# ==================================================
+# CONNECTION
+# ==================================================
+def connect(db_path: Path):
+    conn = sqlite3.connect(str(db_path), timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# ==================================================
+# READ
+# ==================================================
+def load_notes(conn):
+    """Notes in the same {"past__target": {...}} shape as course_notes.json."""
+    rows = conn.execute(
+        "SELECT past_id, target_id, description, notes, url FROM notes"
+    )
+    notes_db = {}
+    for past_id, target_id, description, notes, url in rows:
+        record = {"description": description, "notes": notes}
+        if url:
+            record["url"] = url
+        notes_db[note_key(past_id, target_id)] = record
+    return notes_db
+
+
+def load_links(conn):
+    """Links in the same {course_id: url} shape as course_links.json."""
+    return dict(conn.execute("SELECT course_id, url FROM links"))
+
+
+# ==================================================
+# WRITE
+# ==================================================
+def upsert_notes(conn, records):
+    """
+    records: iterable of (past_id, target_id, description, notes).
+    Only description and notes are updated; a stored url is kept.
+    """
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO notes (past_id, target_id, description, notes)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (past_id, target_id) DO UPDATE SET
+                description = excluded.description,
+                notes = excluded.notes,
+                updated_at = strftime('%Y-%m-%dT%H:%M:%SZ', 'now')
+            """,
+            [(p, t, _text(d), _text(n)) for p, t, d, n in records],
+        )
+
+
+def upsert_links(conn, items):
+    """items: iterable of (course_id, url)."""
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO links (course_id, url) VALUES (?, ?)
+            ON CONFLICT (course_id) DO UPDATE SET
+                url = excluded.url,
+                updated_at = strftime('%Y-%m-%dT%H:%M:%SZ', 'now')
+            """,
+            [(c, _text(u)) for c, u in items],
+        )
+
+
+# ==================================================
+# MIGRATION
+# ==================================================
+def migrate_from_json(conn, notes_path: Path, links_path: Path):
+    """
+    Copy course_notes.json / course_links.json into the database, with
+    their journals (utils.journal) folded in so uncompacted edits are kept.
+    Rows already present are left untouched, so re-running is safe.
+    Returns (notes inserted, links inserted).
+    """
+    notes_db = journal.load_journaled(notes_path)
+    links_db = journal.load_journaled(links_path)
+
+    note_rows = []
+    for key, record in notes_db.items():
+        past_id, target_id = split_note_key(key)
+        note_rows.append((
+            past_id,
+            target_id,
+            _text(record.get("description")),
+            _text(record.get("notes")),
+            _text(record.get("url")),
+        ))
+
+    with conn:
+        before = conn.total_changes
+        conn.executemany(
+            """
+            INSERT INTO notes (past_id, target_id, description, notes, url)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (past_id, target_id) DO NOTHING
+            """,
+            note_rows,
+        )
+        notes_inserted = conn.total_changes - before
+
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT INTO links (course_id, url) VALUES (?, ?) ON CONFLICT (course_id) DO NOTHING",
+            [(c, _text(u)) for c, u in links_db.items()],
+        )
+        links_inserted = conn.total_changes - before
+
+    return notes_inserted, links_inserted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate course notes/links JSON into SQLite")
+    parser.add_argument("--exports-dir", type=Path, default=EXPORT_DIR)
+    args = parser.parse_args(argv)
+
+    db_path = args.exports_dir / DB_NAME
+    conn = connect(db_path)
+    n_notes, n_links = migrate_from_json(
+        conn,
+        args.exports_dir / NOTES_NAME,
+        args.exports_dir / LINKS_NAME,
+    )
+    conn.close()
+
+    print(f"✅ Migrated {n_notes} notes and {n_links} links into {db_path}")
+
+
+if __name__ == "__main__":
+    main()
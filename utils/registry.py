@@ -0,0 +1,111 @@
+"""
+Hashed lookups over the course registries.
+
+Registry is built once from data/registries/source_courses_index.json,
+data/registries/mapping_index.json and the mapping files they point to, and
+answers by-source, by-mapping-file and by-target lookups from dicts instead
+of scanning the index lists. load_registry() keeps one Registry per data
+directory and rebuilds it only when a registry or mapping file changes.
+"""
+
+import threading
+from pathlib import Path
+
+from utils.loaders import list_json_files, load_index
+from utils.validation import load_valid
+
+DATA_DIR = Path("data")
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+class Registry:
+    def __init__(self, source_index, mapping_index, mappings_dir: Path):
+        self.sources = list(source_index)
+        self.mapping_index = list(mapping_index)
+
+        self.source_by_code = {}
+        for entry in self.sources:
+            self.source_by_code.setdefault(entry["course_code"], entry)
+
+        # first entry wins, as the linear next(...) scans did
+        self.mapping_by_source = {}
+        self.source_by_mapping_file = {}
+        for entry in self.mapping_index:
+            self.mapping_by_source.setdefault(entry["source_course"], entry)
+            self.source_by_mapping_file.setdefault(entry["mapping_file"], entry["source_course"])
+
+        self.mapping_by_file = {}
+        self.sources_by_target = {}
+        for source_code, entry in self.mapping_by_source.items():
+            mapping = load_valid(mappings_dir / entry["mapping_file"], "mapping")
+            if mapping is None:
+                continue
+            self.mapping_by_file[entry["mapping_file"]] = mapping
+            for target in mapping["target_courses"]:
+                sources = self.sources_by_target.setdefault(target["course_code"], [])
+                if source_code not in sources:
+                    sources.append(source_code)
+
+    # ------------------------------
+    # by source course
+    # ------------------------------
+    def source(self, source_code):
+        return self.source_by_code.get(source_code)
+
+    def mapping_file(self, source_code):
+        entry = self.mapping_by_source.get(source_code)
+        return entry["mapping_file"] if entry else None
+
+    def mapping(self, source_code):
+        """Validated mapping record of a source course, or None."""
+        return self.mapping_by_file.get(self.mapping_file(source_code))
+
+    # ------------------------------
+    # by mapping file / target course
+    # ------------------------------
+    def source_for_mapping_file(self, mapping_file):
+        return self.source_by_mapping_file.get(mapping_file)
+
+    def sources_for_target(self, target_code):
+        """Source course codes whose mapping lists target_code."""
+        return list(self.sources_by_target.get(target_code, []))
+
+
+# ==================================================
+# CACHED LOADING
+# ==================================================
+def _stamp(data_dir: Path):
+    registries = data_dir / "registries"
+    files = [
+        registries / "source_courses_index.json",
+        registries / "mapping_index.json",
+        *list_json_files(data_dir / "mappings")
+    ]
+    stamp = []
+    for file in files:
+        if file.exists():
+            stat = file.stat()
+            stamp.append((str(file), stat.st_mtime_ns, stat.st_size))
+    return tuple(stamp)
+
+
+def load_registry(data_dir: Path = DATA_DIR):
+    """Registry for data_dir, reused until a registry or mapping file changes."""
+    key = str(Path(data_dir).resolve())
+    stamp = _stamp(data_dir)
+
+    with _registries_lock:
+        cached = _registries.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    registry = Registry(
+        load_index(data_dir / "registries" / "source_courses_index.json"),
+        load_index(data_dir / "registries" / "mapping_index.json"),
+        data_dir / "mappings"
+    )
+    with _registries_lock:
+        _registries[key] = (stamp, registry)
+    return registry
@@ -0,0 +1,74 @@
+"""
+On-disk cache of rendered Graphviz output.
+
+Rendered artifacts are keyed on a hash of the DOT source, layout engine and
+output format, so an unchanged graph is laid out once and then served from
+disk. The cache directory is bounded by size; least recently used files are
+evicted first (a hit refreshes the file's mtime).
+"""
+
+import hashlib
+import os
+import stat
+from pathlib import Path
+
+from graphviz import ExecutableNotFound
+
+from utils.loaders import write_if_changed
+
+CACHE_DIR = Path("data/cache/renders")
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def render_key(dot, fmt):
+    payload = "\0".join([dot.engine, fmt, dot.source])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _evict(cache_dir: Path, max_bytes):
+    # other sessions evict and write into the same directory; a file that
+    # disappears while we look at it is simply skipped
+    stats = {}
+    for p in cache_dir.iterdir():
+        if p.name.startswith("."):
+            # write_if_changed's temp file, still being written by another session
+            continue
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            stats[p] = st
+    total = sum(st.st_size for st in stats.values())
+
+    for p in sorted(stats, key=lambda p: stats[p].st_mtime_ns):
+        if total <= max_bytes:
+            break
+        total -= stats[p].st_size
+        p.unlink(missing_ok=True)
+
+
+def render_cached(dot, fmt="svg", cache_dir: Path = CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """
+    Rendered bytes for a graphviz.Digraph in the given format, served from
+    the cache when the same DOT source was rendered before. Returns None if
+    the Graphviz executables are not installed.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"{render_key(dot, fmt)}.{fmt}"
+
+    try:
+        os.utime(path)
+        return path.read_bytes()
+    except FileNotFoundError:
+        # not rendered yet, or evicted by another session just now
+        pass
+
+    try:
+        data = dot.pipe(format=fmt)
+    except ExecutableNotFound:
+        return None
+
+    write_if_changed(path, data)
+    _evict(cache_dir, max_bytes)
+    return data
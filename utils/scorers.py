@@ -0,0 +1,229 @@
+"""
+Topic overlap scoring between source (NUS) and target (Oulu) courses.
+
+Every source course is described by its key_topics and learning_objectives,
+every target course by its learning_outcomes and core_topics. Both sides
+are turned into TF-IDF rows over one shared vocabulary (sublinear tf,
+smoothed idf, L2-normalised), and all source × target cosine similarities
+come out of a single sparse product S @ Tᵀ.
+
+    python -m utils.scorers                      # top 5 Oulu courses per NUS course
+    python -m utils.scorers --source EE2023 -k 10
+    python -m utils.scorers --csv overlap.csv    # full ranked matrix
+
+Scores are suggestions for the hand-written data/mappings files, not a
+replacement for them.
+"""
+
+import argparse
+import csv
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+from utils.loaders import list_json_files
+from utils.search import tokenize
+from utils.targets import load_target_registry
+from utils.validation import load_valid
+
+DATA_DIR = Path("data")
+
+Course = namedtuple("Course", ["code", "name", "texts"])
+
+
+# ==================================================
+# CORPUS
+# ==================================================
+def _flatten_topics(topics):
+    """core_topics is either a list or a {category: [topics]} dict."""
+    if isinstance(topics, dict):
+        return [t for values in topics.values() for t in values]
+    return list(topics)
+
+
+def source_courses(data_dir: Path = DATA_DIR):
+    courses = []
+    for file in list_json_files(data_dir / "source_courses"):
+        record = load_valid(file, "source_course")
+        if record is not None:
+            c = record["source_course"]
+            courses.append(Course(c["code"], c["name"], [*c["key_topics"], *c["learning_objectives"]]))
+    return courses
+
+
+def target_courses(data_dir: Path = DATA_DIR):
+    courses = []
+    root = data_dir / "target_courses"
+    for summary in load_target_registry(data_dir):
+        record = load_valid(root / summary["target_file"], "target_course")
+        if record is not None:
+            c = record["target_course"]
+            courses.append(Course(c["code"], c["name"], [*c["learning_outcomes"], *_flatten_topics(c["core_topics"])]))
+    return courses
+
+
+# ==================================================
+# TF-IDF
+# ==================================================
+def _count_matrix(courses, vocab):
+    """Term-count CSR (courses × vocab); new terms are added to vocab."""
+    indptr = [0]
+    indices = []
+    data = []
+    for course in courses:
+        counts = {}
+        for text in course.texts:
+            for term in tokenize(text):
+                col = vocab.setdefault(term, len(vocab))
+                counts[col] = counts.get(col, 0) + 1
+        indices.extend(counts.keys())
+        data.extend(counts.values())
+        indptr.append(len(indices))
+    return indptr, indices, data
+
+
+def tfidf(*corpora):
+    """One L2-normalised TF-IDF CSR per corpus, over a shared vocabulary; plus the terms."""
+    vocab = {}
+    parts = [_count_matrix(courses, vocab) for courses in corpora]
+    matrices = [
+        sparse.csr_matrix(
+            (np.array(data, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr)),
+            shape=(len(indptr) - 1, len(vocab))
+        )
+        for indptr, indices, data in parts
+    ]
+
+    stacked = sparse.vstack(matrices, format="csr")
+    df = np.bincount(stacked.indices, minlength=len(vocab))
+    idf = np.log((1 + stacked.shape[0]) / (1 + df)) + 1
+
+    weighted = []
+    for m in matrices:
+        m = m.copy()
+        m.data = 1 + np.log(m.data)
+        m = m.multiply(idf).tocsr()
+        norms = np.sqrt(m.multiply(m).sum(axis=1)).A1
+        norms[norms == 0] = 1
+        weighted.append(sparse.diags(1 / norms) @ m)
+
+    terms = [None] * len(vocab)
+    for term, col in vocab.items():
+        terms[col] = term
+    return weighted, terms
+
+
+# ==================================================
+# SCORES
+# ==================================================
+class OverlapScores:
+    """
+    scores[i, j] is the cosine similarity of sources[i] and targets[j];
+    ranking[i] lists target indices for sources[i], best first.
+    """
+
+    def __init__(self, sources, targets):
+        self.sources = sources
+        self.targets = targets
+        (self.S, self.T), self.terms = tfidf(sources, targets)
+        self.scores = (self.S @ self.T.T).toarray()
+        self.ranking = np.argsort(-self.scores, axis=1, kind="stable")
+        self.source_row = {c.code: i for i, c in enumerate(sources)}
+        self.target_row = {c.code: j for j, c in enumerate(targets)}
+
+    def top(self, source_code, k=5):
+        """[(target Course, score)] for source_code, best first, zero scores left out."""
+        i = self.source_row.get(source_code)
+        if i is None:
+            return []
+        return [
+            (self.targets[j], float(self.scores[i, j]))
+            for j in self.ranking[i, :k]
+            if self.scores[i, j] > 0
+        ]
+
+    def shared_terms(self, source_code, target_code, n=5):
+        """Terms contributing most to one pair's score; [] for an unknown code."""
+        i = self.source_row.get(source_code)
+        j = self.target_row.get(target_code)
+        if i is None or j is None:
+            return []
+        product = self.S[i].multiply(self.T[j]).tocoo()
+        order = np.argsort(-product.data)[:n]
+        return [self.terms[product.col[o]] for o in order]
+
+    def rows(self):
+        """One dict per (source, target) pair, ranked within each source."""
+        for i, source in enumerate(self.sources):
+            for rank, j in enumerate(self.ranking[i], start=1):
+                yield {
+                    "source_course": source.code,
+                    "target_course": self.targets[j].code,
+                    "target_name": self.targets[j].name,
+                    "rank": rank,
+                    "score": round(float(self.scores[i, j]), 4),
+                }
+
+
+_cached = {}
+_cached_lock = threading.Lock()
+
+
+def load_overlap_scores(data_dir: Path = DATA_DIR):
+    """OverlapScores for the data/ tree, recomputed only when a course changes."""
+    sources = source_courses(data_dir)
+    targets = target_courses(data_dir)
+    key = (str(Path(data_dir).resolve()), tuple(sources), tuple(targets))
+
+    with _cached_lock:
+        cached = _cached.get("scores")
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    scores = OverlapScores(sources, targets)
+    with _cached_lock:
+        _cached["scores"] = (key, scores)
+    return scores
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score NUS courses against Oulu courses by topic overlap")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--source", nargs="*", default=None, help="source course codes (default: all)")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--csv", type=Path, default=None, help="write the full ranked matrix to a CSV file")
+    args = parser.parse_args(argv)
+
+    overlap = load_overlap_scores(args.data_dir)
+    if not overlap.sources or not overlap.targets:
+        print("❌ Need at least one valid source and one valid target course")
+        return 1
+
+    if args.csv:
+        with args.csv.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["source_course", "target_course", "target_name", "rank", "score"])
+            writer.writeheader()
+            writer.writerows(overlap.rows())
+        print(f"✅ {args.csv} ({len(overlap.sources)} × {len(overlap.targets)} pairs)")
+        return 0
+
+    for code in args.source or [c.code for c in overlap.sources]:
+        top = overlap.top(code, args.k)
+        if not top:
+            print(f"⚠️ {code}: no overlapping Oulu course")
+            continue
+        print(f"✅ {code}")
+        for target, score in top:
+            shared = ", ".join(overlap.shared_terms(code, target.code))
+            print(f"  {score:.3f}  {target.code} — {target.name}  ({shared})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,414 @@
+"""
+BM25 full-text search over course content.
+
+Indexed text, one document per course:
+
+    source   data/source_courses/*.json        name, key_topics, learning_objectives
+    target   data/target_courses/<inst>/*.json name, course_description, learning_outcomes
+    past     data/past_courses/*.json          course_name, justification (one per past course)
+
+    python -m utils.search "laplace transform"
+    python -m utils.search "anova" --kind target -k 5
+    python -m utils.search --rebuild "bode plots"
+
+The inverted index is a term × document CSR matrix of term frequencies
+(the base segment) plus a small dict of postings for documents added
+since the last compaction (the delta segment). A changed file only
+tombstones its old documents and tokenises its new ones into the delta;
+the two are merged with one vectorised pass once the delta or the
+tombstones grow past COMPACT_RATIO of the index. The index is pickled to
+data/cache/search_index.pkl and refreshed against per-file (mtime, size)
+stamps, so a restart re-reads only the files that changed.
+"""
+
+import argparse
+import math
+import pickle
+import re
+import threading
+import time
+from collections import Counter, namedtuple
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+from utils.loaders import list_json_files, write_if_changed
+from utils.validation import load_valid
+
+DATA_DIR = Path("data")
+INDEX_NAME = "cache/search_index.pkl"
+INDEX_VERSION = 1
+
+K1 = 1.2
+B = 0.75
+COMPACT_RATIO = 0.1
+COMPACT_MIN_DOCS = 1000
+REFRESH_INTERVAL = 2.0
+
+KINDS = ["source", "target", "past"]
+
+Doc = namedtuple("Doc", ["kind", "code", "title", "file", "texts"])
+Hit = namedtuple("Hit", ["score", "doc"])
+
+
+# ==================================================
+# TEXT
+# ==================================================
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it its of on or that the "
+    "this to with using use their such via".split()
+)
+
+
+def _normalize(token):
+    # plural folding only: "plots" → "plot", but "analysis", "class" stay
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [_normalize(t) for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def documents_for(kind, path: Path, file_key):
+    """Docs contributed by one data file; [] if it is missing or invalid."""
+    if kind == "source":
+        record = load_valid(path, "source_course")
+        if record is None:
+            return []
+        c = record["source_course"]
+        return [Doc(kind, c["code"], c["name"], file_key, [c["name"], *c["key_topics"], *c["learning_objectives"]])]
+
+    if kind == "target":
+        record = load_valid(path, "target_course")
+        if record is None:
+            return []
+        c = record["target_course"]
+        return [Doc(kind, c["code"], c["name"], file_key, [c["name"], c["course_description"], *c["learning_outcomes"]])]
+
+    record = load_valid(path, "past_courses")
+    if record is None:
+        return []
+    code = record["nus_course_code"] or path.stem
+    return [
+        Doc(kind, code, f"{pc['course_name']} ({pc['institution']})", file_key, [pc["course_name"], pc["justification"]])
+        for pc in record["past_courses"]
+    ]
+
+
+def tracked_files(data_dir: Path):
+    """[(kind, path)] of every file the index covers."""
+    files = [("source", f) for f in list_json_files(data_dir / "source_courses")]
+    target_root = data_dir / "target_courses"
+    if target_root.exists():
+        for inst_dir in sorted(d for d in target_root.iterdir() if d.is_dir()):
+            files += [("target", f) for f in list_json_files(inst_dir)]
+        # specs at the root (oulu_<code>_....json) are registered too, see utils.targets
+        files += [("target", f) for f in list_json_files(target_root)]
+    files += [("past", f) for f in list_json_files(data_dir / "past_courses")]
+    return files
+
+
+# ==================================================
+# INDEX
+# ==================================================
+class SearchIndex:
+    def __init__(self):
+        self.version = INDEX_VERSION
+        self.docs = []              # doc id → Doc, or None once removed
+        self.doc_len = []           # doc id → token count
+        self.files = {}             # file key → (stamp, [doc ids])
+        self.n_alive = 0
+        self.total_len = 0
+
+        self.vocab = {}             # term → row of matrix
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self.delta = {}             # term → {doc id: tf} for doc ids ≥ matrix.shape[1]
+        self.n_dead = 0
+
+        self._arrays = None
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_arrays"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self.n_alive
+
+    # ------------------------------
+    # updates
+    # ------------------------------
+    def add_documents(self, file_key, stamp, docs):
+        """Replace the documents of file_key with docs."""
+        with self._lock:
+            self.remove_file(file_key)
+            ids = []
+            for doc in docs:
+                doc_id = len(self.docs)
+                counts = Counter(t for text in doc.texts for t in tokenize(text))
+                for term, tf in counts.items():
+                    self.delta.setdefault(term, {})[doc_id] = tf
+                length = sum(counts.values())
+                self.docs.append(doc)
+                self.doc_len.append(length)
+                self.n_alive += 1
+                self.total_len += length
+                ids.append(doc_id)
+            self.files[file_key] = (stamp, ids)
+            self._arrays = None
+
+    def remove_file(self, file_key):
+        with self._lock:
+            _, ids = self.files.pop(file_key, (None, []))
+            for doc_id in ids:
+                self.docs[doc_id] = None
+                self.n_alive -= 1
+                self.total_len -= self.doc_len[doc_id]
+                self.n_dead += 1
+            if ids:
+                self._arrays = None
+
+    def needs_compaction(self):
+        pending = self.n_dead + len(self.docs) - self.matrix.shape[1]
+        return pending > max(COMPACT_MIN_DOCS, COMPACT_RATIO * len(self.docs))
+
+    def compact(self):
+        """Merge the delta into the matrix, dropping removed documents and unused terms."""
+        with self._lock:
+            alive = np.array([d is not None for d in self.docs], dtype=bool)
+            new_id = np.cumsum(alive) - 1
+
+            base = self.matrix.tocoo()
+            keep = alive[base.col] if base.nnz else np.zeros(0, dtype=bool)
+            rows = [base.row[keep]]
+            cols = [base.col[keep]]
+            data = [base.data[keep]]
+
+            for term, postings in self.delta.items():
+                row = self.vocab.setdefault(term, len(self.vocab))
+                ids = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+                tfs = np.fromiter(postings.values(), dtype=np.float32, count=len(postings))
+                mask = alive[ids]
+                rows.append(np.full(mask.sum(), row, dtype=np.int64))
+                cols.append(ids[mask])
+                data.append(tfs[mask])
+
+            rows = np.concatenate(rows).astype(np.int64)
+            cols = new_id[np.concatenate(cols).astype(np.int64)] if len(self.docs) else np.zeros(0, dtype=np.int64)
+            data = np.concatenate(data).astype(np.float32)
+
+            # renumber terms so that terms without postings disappear
+            used = np.bincount(rows, minlength=len(self.vocab)) > 0
+            new_row = np.cumsum(used) - 1
+            terms = [None] * int(used.sum())
+            for term, row in self.vocab.items():
+                if used[row]:
+                    terms[new_row[row]] = term
+
+            self.vocab = {term: i for i, term in enumerate(terms)}
+            self.matrix = sparse.csr_matrix(
+                (data, (new_row[rows], cols)), shape=(len(terms), int(alive.sum()))
+            )
+            self.docs = [d for d in self.docs if d is not None]
+            self.doc_len = [n for n, a in zip(self.doc_len, alive) if a]
+            self.files = {
+                key: (stamp, [int(new_id[i]) for i in ids]) for key, (stamp, ids) in self.files.items()
+            }
+            self.delta = {}
+            self.n_dead = 0
+            self._arrays = None
+
+    # ------------------------------
+    # queries
+    # ------------------------------
+    def _query_arrays(self):
+        if self._arrays is None:
+            kind_code = {k: i for i, k in enumerate(KINDS)}
+            self._arrays = {
+                "alive": np.array([d is not None for d in self.docs], dtype=bool),
+                "doc_len": np.array(self.doc_len, dtype=np.float32),
+                "kind": np.array([kind_code[d.kind] if d else -1 for d in self.docs], dtype=np.int8),
+            }
+        return self._arrays
+
+    def _postings(self, term):
+        """(doc ids, tfs) of term across both segments, removed docs included."""
+        parts_ids, parts_tf = [], []
+        row = self.vocab.get(term)
+        if row is not None:
+            start, stop = self.matrix.indptr[row], self.matrix.indptr[row + 1]
+            parts_ids.append(self.matrix.indices[start:stop])
+            parts_tf.append(self.matrix.data[start:stop])
+        postings = self.delta.get(term)
+        if postings:
+            parts_ids.append(np.fromiter(postings.keys(), dtype=np.int32, count=len(postings)))
+            parts_tf.append(np.fromiter(postings.values(), dtype=np.float32, count=len(postings)))
+        if not parts_ids:
+            return None, None
+        if len(parts_ids) == 1:
+            return parts_ids[0], parts_tf[0]
+        return np.concatenate(parts_ids), np.concatenate(parts_tf)
+
+    def search(self, query, k=20, kinds=None):
+        """Top-k Hits for query, best first; kinds restricts to some of KINDS."""
+        with self._lock:
+            if not self.n_alive:
+                return []
+            arrays = self._query_arrays()
+            alive, doc_len = arrays["alive"], arrays["doc_len"]
+            avgdl = self.total_len / self.n_alive or 1.0
+            scores = np.zeros(len(self.docs), dtype=np.float32)
+
+            for term in dict.fromkeys(tokenize(query)):
+                ids, tfs = self._postings(term)
+                if ids is None:
+                    continue
+                live = alive[ids]
+                ids, tfs = ids[live], tfs[live]
+                df = len(ids)
+                if not df:
+                    continue
+                idf = math.log(1 + (self.n_alive - df + 0.5) / (df + 0.5))
+                norm = K1 * (1 - B + B * doc_len[ids] / avgdl)
+                scores[ids] += idf * tfs * (K1 + 1) / (tfs + norm)
+
+            if kinds:
+                scores[~np.isin(arrays["kind"], [KINDS.index(kd) for kd in kinds])] = 0
+
+            hits = np.flatnonzero(scores)
+            if len(hits) > k:
+                hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+            hits = hits[np.argsort(-scores[hits], kind="stable")]
+            return [Hit(float(scores[i]), self.docs[i]) for i in hits]
+
+
+def snippet(doc, query):
+    """The text of doc sharing most terms with query."""
+    terms = set(tokenize(query))
+    return max(doc.texts, key=lambda text: len(terms & set(tokenize(text))), default="")
+
+
+# ==================================================
+# REFRESH / PERSISTENCE
+# ==================================================
+def index_path_for(data_dir: Path = DATA_DIR):
+    return data_dir / INDEX_NAME
+
+
+def _stamp(path: Path):
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def refresh(index, data_dir: Path = DATA_DIR):
+    """Re-index files that were added, changed or removed; returns how many."""
+    current = {}
+    for kind, path in tracked_files(data_dir):
+        current[path.relative_to(data_dir).as_posix()] = (kind, path)
+
+    updated = 0
+    with index._lock:
+        for file_key in set(index.files) - set(current):
+            index.remove_file(file_key)
+            updated += 1
+        for file_key, (kind, path) in current.items():
+            stamp = _stamp(path)
+            known = index.files.get(file_key)
+            if known is None or known[0] != stamp:
+                index.add_documents(file_key, stamp, documents_for(kind, path, file_key))
+                updated += 1
+        if index.needs_compaction():
+            index.compact()
+    return updated
+
+
+def save_index(index, path: Path):
+    with index._lock:
+        data = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+    # unique temp file + atomic rename: sessions saving at once never share
+    # a temp file or leave a partial pickle behind
+    write_if_changed(path, data)
+
+
+def read_index(path: Path):
+    """Persisted index, or a new empty one if missing, unreadable or from another version."""
+    try:
+        index = pickle.loads(path.read_bytes())
+    except Exception:
+        return SearchIndex()
+    if getattr(index, "version", None) != INDEX_VERSION:
+        return SearchIndex()
+    return index
+
+
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def load_search_index(data_dir: Path = DATA_DIR, rebuild=False):
+    """
+    Shared index for data_dir: read from disk once per process, refreshed
+    at most every REFRESH_INTERVAL seconds and written back when it changed.
+    """
+    key = str(Path(data_dir).resolve())
+    path = index_path_for(data_dir)
+
+    with _loaded_lock:
+        cached = _loaded.get(key)
+        if cached is None or rebuild:
+            cached = _loaded[key] = [SearchIndex() if rebuild else read_index(path), None]
+        index, last_refresh = cached
+        now = time.monotonic()
+        if last_refresh is not None and now - last_refresh < REFRESH_INTERVAL:
+            return index
+        cached[1] = now
+
+    if refresh(index, data_dir) or not path.exists():
+        save_index(index, path)
+    return index
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BM25 search over course content")
+    parser.add_argument("query", nargs="+")
+    parser.add_argument("-k", type=int, default=10, help="number of results")
+    parser.add_argument("--kind", nargs="*", choices=KINDS, default=None)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--rebuild", action="store_true", help="re-index every file from scratch")
+    args = parser.parse_args(argv)
+
+    query = " ".join(args.query)
+    index = load_search_index(args.data_dir, rebuild=args.rebuild)
+
+    started = time.perf_counter()
+    hits = index.search(query, k=args.k, kinds=args.kind)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if not hits:
+        print(f"⚠️ No matches for {query!r} ({len(index)} documents)")
+        return 1
+
+    print(f"✅ {len(hits)} matches for {query!r} in {elapsed_ms:.2f} ms ({len(index)} documents)")
+    for rank, hit in enumerate(hits, start=1):
+        doc = hit.doc
+        print(f"{rank:>3}. {hit.score:6.2f}  [{doc.kind}] {doc.code} — {doc.title}")
+        print(f"        {snippet(doc, query)[:120]}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,234 @@
+"""
+Compiled catalog snapshot.
+
+Compiles data/registries, data/source_courses, data/past_courses,
+data/mappings, data/target_courses/oulu and the exported mapping graph into
+one pickle file with pre-built lookup tables, so a cold page load is a single
+read instead of one open + decode per JSON file. Documents are validated on
+the way in (utils.validation): the tables hold normalised records only, and
+files that fail their schema are listed under "errors".
+
+Build it with:
+
+    python -m utils.snapshot            # writes data/catalog.snapshot
+    python -m utils.snapshot --data-dir data --out /tmp/catalog.snapshot
+
+The snapshot records the (mtime, size) of every file it was built from. When
+a file is added, removed or edited the snapshot is treated as stale and
+load_catalog() falls back to a live build (kept per process until the next
+change); run `python -m utils.snapshot` again to make cold loads fast again.
+"""
+
+import argparse
+import pickle
+import threading
+from pathlib import Path
+
+from utils.graph_model import load_graph_model
+from utils.loaders import list_json_files, load_index, write_if_changed
+from utils.registry import Registry
+from utils.targets import bare_code
+from utils.validation import validate_file
+
+SNAPSHOT_VERSION = 4
+
+DATA_DIR = Path("data")
+SNAPSHOT_NAME = "catalog.snapshot"
+
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def _tracked_paths(data_dir: Path):
+    return {
+        "registries": data_dir / "registries",
+        "source_courses": data_dir / "source_courses",
+        "past_courses": data_dir / "past_courses",
+        "mappings": data_dir / "mappings",
+        "target_courses": data_dir / "target_courses" / "oulu",
+        "graph": data_dir / "exports" / "course_mapping_graph.json",
+    }
+
+
+def _stamp(path: Path):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _stamps(data_dir: Path):
+    """(mtime, size) of every tracked file, so in-place edits are noticed too."""
+    stamps = {}
+    for name, path in _tracked_paths(data_dir).items():
+        files = [path] if path.suffix == ".json" else list_json_files(path)
+        stamps[name] = {file.name: _stamp(file) for file in files}
+    return stamps
+
+
+# ==================================================
+# BUILD
+# ==================================================
+def build_snapshot(data_dir: Path = DATA_DIR):
+    """
+    Read the data/ tree and return the catalog as a dict of lookup tables.
+    Unreadable or off-schema files are skipped and listed under "errors".
+    """
+    paths = _tracked_paths(data_dir)
+    errors = []
+
+    def valid(file, kind):
+        verdict = validate_file(file, kind)
+        if not verdict.ok:
+            errors.append((str(file), "; ".join(verdict.errors)))
+        return verdict.record
+
+    source_index = load_index(paths["registries"] / "source_courses_index.json")
+    mapping_index = load_index(paths["registries"] / "mapping_index.json")
+
+    mapping_by_source = {}
+    for m in mapping_index:
+        mapping_by_source.setdefault(m["source_course"], m["mapping_file"])
+
+    mappings = {}
+    for file in list_json_files(paths["mappings"]):
+        data = valid(file, "mapping")
+        if data is not None:
+            mappings[file.name] = data
+
+    # files may carry a title suffix (ESP2107_Numerical_Methods_...json);
+    # key them by the course they are evidence for, as utils.impact does
+    past_by_code = {}
+    for file in list_json_files(paths["past_courses"]):
+        data = valid(file, "past_courses")
+        if data is not None:
+            past_by_code.setdefault(data["nus_course_code"] or bare_code(file.stem), data)
+
+    source_courses = {}
+    for file in list_json_files(paths["source_courses"]):
+        data = valid(file, "source_course")
+        if data is not None:
+            source_courses[data["source_course"]["code"]] = data
+
+    target_courses = {}
+    target_files = {}
+    for file in list_json_files(paths["target_courses"]):
+        data = valid(file, "target_course")
+        if data is not None:
+            target_courses[data["target_course"]["code"]] = data
+            target_files[file.stem] = file.name
+
+    # the export may be too large to hold whole; it is streamed into the
+    # model and checked by `python -m utils.validation` instead
+    graph_model = load_graph_model(paths["graph"])
+    if graph_model is None and paths["graph"].exists():
+        errors.append((str(paths["graph"]), "unreadable JSON"))
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "stamps": _stamps(data_dir),
+        "source_index": source_index,
+        "source_by_code": {c["course_code"]: c for c in source_index},
+        "mapping_index": mapping_index,
+        "mapping_by_source": mapping_by_source,
+        "mappings": mappings,
+        "registry": Registry(source_index, mapping_index, paths["mappings"]),
+        "past_by_code": past_by_code,
+        "source_courses": source_courses,
+        "target_courses": target_courses,
+        "target_files": target_files,
+        "graph_model": graph_model,
+        "errors": errors,
+    }
+
+
+def write_snapshot(snapshot, out_path: Path):
+    write_if_changed(out_path, pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+# ==================================================
+# LOAD
+# ==================================================
+def load_snapshot(path: Path, data_dir: Path = DATA_DIR, stamps=None):
+    """
+    Return the snapshot at path, or None if it is missing, from another
+    version, or older than the data/ tree. Decoded snapshots are kept per
+    process and reused while the snapshot file is unchanged.
+    """
+    if not path.exists():
+        return None
+
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cache_key = str(path.resolve())
+
+    with _loaded_lock:
+        cached = _loaded.get(cache_key)
+
+    if cached is not None and cached[0] == stamp:
+        snapshot = cached[1]
+    else:
+        try:
+            snapshot = pickle.loads(path.read_bytes())
+        except Exception:
+            return None
+        with _loaded_lock:
+            _loaded[cache_key] = (stamp, snapshot)
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    if snapshot.get("stamps") != (stamps if stamps is not None else _stamps(data_dir)):
+        return None
+    return snapshot
+
+
+def load_catalog(data_dir: Path = DATA_DIR):
+    """
+    Catalog tables for the pages: the compiled snapshot when it is fresh,
+    otherwise a live build from the data/ tree (same shape), reused until
+    a tracked file changes.
+    """
+    stamps = _stamps(data_dir)
+    snapshot = load_snapshot(data_dir / SNAPSHOT_NAME, data_dir, stamps)
+    if snapshot is not None:
+        return snapshot
+
+    cache_key = ("live", str(Path(data_dir).resolve()))
+    with _loaded_lock:
+        cached = _loaded.get(cache_key)
+    if cached is not None and cached["stamps"] == stamps:
+        return cached
+
+    snapshot = build_snapshot(data_dir)
+    with _loaded_lock:
+        _loaded[cache_key] = snapshot
+    return snapshot
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the data/ tree into a catalog snapshot")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    out_path = args.out or args.data_dir / SNAPSHOT_NAME
+    snapshot = build_snapshot(args.data_dir)
+    write_snapshot(snapshot, out_path)
+
+    print(
+        f"✅ Snapshot written to {out_path} "
+        f"({len(snapshot['source_index'])} source, "
+        f"{len(snapshot['past_by_code'])} past, "
+        f"{len(snapshot['mappings'])} mapping, "
+        f"{len(snapshot['target_courses'])} target files)"
+    )
+    for file, reason in snapshot["errors"]:
+        print(f"⚠️ Skipped {file}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
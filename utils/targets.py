@@ -0,0 +1,220 @@
+"""
+Target course resolver for data/target_courses/<institution>/.
+
+Mapping files name target courses either by bare code (805305A) or by
+the file stem style code_Title (805305A_Regression_ANOVA), and the two
+titles do not always agree. TargetIndex maps the exact stem, the
+record's own code and the bare code to one file, so a lookup is a dict
+hit instead of a directory glob per target.
+
+    from utils.targets import load_target_index
+    index = load_target_index(target_dir_for("oulu"))
+    index.record("805305A_Introduction_to_Regression")   # → 805305A_Regression_ANOVA.json
+
+The index is rebuilt when the directory's mtime or the target registry
+changes; records come from the validation cache, which follows in-place
+edits on its own.
+
+The target registry, data/registries/target_courses_index.json, holds a
+compact summary per spec (code, name, ECTS, level, teaching period) so
+listings never open the full files. Regenerate it after editing specs:
+
+    python -m utils.targets                  # write data/registries/target_courses_index.json
+    python -m utils.targets --check          # exit 1 if the registry is out of date
+"""
+
+import argparse
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from utils.loaders import dumps_json, list_json_files, load_index, write_if_changed
+from utils.validation import load_valid, validate_file
+
+DATA_DIR = Path("data")
+DEFAULT_INSTITUTION = "oulu"
+
+TargetEntry = namedtuple("TargetEntry", ["path", "record"])
+
+
+def bare_code(code):
+    """Course code without its title suffix: 805305A_Regression_ANOVA → 805305A."""
+    return code.split("_", 1)[0]
+
+
+def target_dir_for(institution=DEFAULT_INSTITUTION, data_dir: Path = DATA_DIR):
+    return data_dir / "target_courses" / institution
+
+
+def registry_path_for(data_dir: Path = DATA_DIR):
+    return data_dir / "registries" / "target_courses_index.json"
+
+
+# ==================================================
+# TARGET REGISTRY
+# ==================================================
+def institution_of(target_file):
+    """
+    Institution of a spec path relative to data/target_courses: its
+    directory, or for a file at the root the prefix of its name
+    (oulu_EE2023_oulucoursecode.json → oulu).
+    """
+    parts = Path(target_file).parts
+    if len(parts) > 1:
+        return parts[0]
+    stem = Path(target_file).stem
+    return stem.split("_", 1)[0] if "_" in stem else ""
+
+
+def summarize(record, target_file):
+    """Registry entry for a validated spec; target_file is relative to data/target_courses."""
+    course = record["target_course"]
+    return {
+        "course_code": course["code"],
+        "course_name": course["name"],
+        "institution": institution_of(target_file),
+        "ects": course["credits"],
+        "level": course["level"],
+        "teaching_period": course["teaching_period"],
+        "target_file": target_file,
+    }
+
+
+def build_target_registry(data_dir: Path = DATA_DIR):
+    """(summaries, errors) for every spec under data/target_courses/**; invalid specs are left out."""
+    root = data_dir / "target_courses"
+    summaries = []
+    errors = []
+    for file in sorted(root.rglob("*.json")):
+        verdict = validate_file(file, "target_course")
+        if verdict.ok:
+            summaries.append(summarize(verdict.record, file.relative_to(root).as_posix()))
+        else:
+            errors.append((file, verdict.errors))
+    return summaries, errors
+
+
+def load_target_registry(data_dir: Path = DATA_DIR):
+    """Summaries from the registry file, or built in memory if it was never generated."""
+    path = registry_path_for(data_dir)
+    if path.exists():
+        return load_index(path)
+    return build_target_registry(data_dir)[0]
+
+
+# ==================================================
+# TARGET INDEX
+# ==================================================
+class TargetIndex:
+    def __init__(self, target_dir: Path, summaries=None):
+        self.target_dir = target_dir
+        files = list_json_files(target_dir)
+
+        by_stem = {}
+        by_bare = {}
+        for file in files:
+            by_stem[file.stem] = file
+            by_bare.setdefault(bare_code(file.stem), file)
+
+        # record codes come from the registry summaries when given, so the
+        # specs themselves are not opened
+        by_code = {}
+        self.summary_by_path = {}
+        if summaries is not None:
+            for summary in summaries:
+                file = target_dir.parent / summary["target_file"]
+                if file.parent == target_dir and file.stem in by_stem:
+                    by_code.setdefault(summary["course_code"], file)
+                    self.summary_by_path[file] = summary
+        else:
+            for file in files:
+                record = load_valid(file, "target_course")
+                if record is not None:
+                    by_code.setdefault(record["target_course"]["code"], file)
+
+        # most specific key wins: exact stem, then the record's code, then bare code
+        self.path_by_code = {**by_bare, **by_code, **by_stem}
+
+    def __len__(self):
+        return len(self.path_by_code)
+
+    def path(self, code):
+        """File for code, trying the exact key first and then its bare code."""
+        return self.path_by_code.get(code) or self.path_by_code.get(bare_code(code))
+
+    def summary(self, code):
+        """Registry summary of the spec code resolves to, or None."""
+        return self.summary_by_path.get(self.path(code))
+
+    def resolve(self, code):
+        """TargetEntry(path, record) for code, or None; record is None if the file is invalid."""
+        path = self.path(code)
+        if path is None:
+            return None
+        return TargetEntry(path, load_valid(path, "target_course"))
+
+    def record(self, code):
+        entry = self.resolve(code)
+        return entry.record if entry else None
+
+
+# ==================================================
+# CACHED LOADING
+# ==================================================
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _mtime(path: Path):
+    return path.stat().st_mtime_ns if path.exists() else None
+
+
+def load_target_index(target_dir: Path = None):
+    """
+    TargetIndex for target_dir (default: Oulu, a data/target_courses/<institution>
+    directory), reused until the directory or the target registry changes.
+    """
+    target_dir = Path(target_dir or target_dir_for())
+    data_dir = target_dir.parent.parent
+    key = str(target_dir.resolve())
+    stamp = (_mtime(target_dir), _mtime(registry_path_for(data_dir)))
+
+    with _indexes_lock:
+        cached = _indexes.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    index = TargetIndex(target_dir, load_target_registry(data_dir))
+    with _indexes_lock:
+        _indexes[key] = (stamp, index)
+    return index
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate data/registries/target_courses_index.json")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--check", action="store_true", help="only report whether the registry is up to date")
+    args = parser.parse_args(argv)
+
+    summaries, errors = build_target_registry(args.data_dir)
+    for file, file_errors in errors:
+        print(f"⚠️ Skipped {file}: {'; '.join(file_errors)}")
+
+    path = registry_path_for(args.data_dir)
+    if args.check:
+        if load_index(path) != summaries:
+            print(f"❌ {path} is out of date — run python -m utils.targets")
+            return 1
+        print(f"✅ {path} is up to date ({len(summaries)} courses)")
+        return 0
+
+    changed = write_if_changed(path, dumps_json(summaries))
+    print(f"✅ {path} ({len(summaries)} courses{'' if changed else ', unchanged'})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
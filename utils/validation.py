@@ -0,0 +1,316 @@
+"""
+Ingest-time schema validation for the data/ tree.
+
+Each document kind (source_course, target_course, past_courses, mapping,
+graph export) has a schema that is compiled once into a checker. A checker
+returns the list of problems and a normalised record in which every
+optional field the pages read is present (missing ones get their default),
+so render code can index records directly instead of guarding each field.
+
+Verdicts are cached per file content hash; the hash is only recomputed
+when a file's (mtime, size) changes.
+
+    python -m utils.validation               # report every broken file under data/
+    python -m utils.validation --data-dir data
+"""
+
+import argparse
+import copy
+import hashlib
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from utils.loaders import codec_for, list_json_files
+
+DATA_DIR = Path("data")
+VERDICT_CACHE_MAX = 4096
+
+Verdict = namedtuple("Verdict", ["ok", "errors", "record"])
+
+
+# ==================================================
+# SCHEMA LANGUAGE
+# ==================================================
+class Req:
+    """Required field."""
+    def __init__(self, spec):
+        self.spec = spec
+
+
+class Opt:
+    """Optional field, filled with `default` when missing or null."""
+    def __init__(self, spec, default):
+        self.spec = spec
+        self.default = default
+
+
+class Obj:
+    """Object with the given fields; other keys are kept as they are."""
+    def __init__(self, fields):
+        self.fields = fields
+
+
+class List:
+    def __init__(self, item):
+        self.item = item
+
+
+class Choice:
+    def __init__(self, *values):
+        self.values = values
+
+
+TEXT = (str,)
+NUMBER = (int, float)
+NUMBER_OR_TEXT = (int, float, str)
+
+
+def _type_name(value):
+    return "null" if value is None else type(value).__name__
+
+
+def compile_schema(spec):
+    """Checker function (value, where, errors) -> normalised value."""
+    if isinstance(spec, Obj):
+        fields = [
+            (name, isinstance(f, Req), compile_schema(f.spec), getattr(f, "default", None))
+            for name, f in spec.fields.items()
+        ]
+
+        def check_obj(value, where, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{where or '<root>'}: expected object, got {_type_name(value)}")
+                return value
+            out = dict(value)
+            for name, required, check, default in fields:
+                at = f"{where}.{name}" if where else name
+                if value.get(name) is None:
+                    if required:
+                        errors.append(f"{at}: missing")
+                    else:
+                        out[name] = copy.copy(default)
+                    continue
+                out[name] = check(value[name], at, errors)
+            return out
+        return check_obj
+
+    if isinstance(spec, List):
+        check_item = compile_schema(spec.item)
+
+        def check_list(value, where, errors):
+            if not isinstance(value, list):
+                errors.append(f"{where}: expected list, got {_type_name(value)}")
+                return value
+            return [check_item(v, f"{where}[{i}]", errors) for i, v in enumerate(value)]
+        return check_list
+
+    if isinstance(spec, Choice):
+        def check_choice(value, where, errors):
+            if value not in spec.values:
+                errors.append(f"{where}: {value!r} is not one of {', '.join(map(repr, spec.values))}")
+            return value
+        return check_choice
+
+    types = spec if isinstance(spec, tuple) else (spec,)
+
+    def check_type(value, where, errors):
+        # bool is an int subclass; only accept it where bool is asked for
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            expected = " or ".join(t.__name__ for t in types)
+            errors.append(f"{where}: expected {expected}, got {_type_name(value)}")
+        return value
+    return check_type
+
+
+# ==================================================
+# SCHEMAS
+# ==================================================
+SCHEMAS = {
+    "source_course": Obj({
+        "source_course": Req(Obj({
+            "code": Req(TEXT),
+            "name": Req(TEXT),
+            "credits": Opt(NUMBER_OR_TEXT, "unknown"),
+            "level": Opt(TEXT, "unknown"),
+            "key_topics": Opt(List(TEXT), []),
+            "learning_objectives": Opt(List(TEXT), []),
+        })),
+    }),
+    "target_course": Obj({
+        "target_course": Req(Obj({
+            "code": Req(TEXT),
+            "name": Req(TEXT),
+            "credits": Opt(NUMBER_OR_TEXT, "unknown"),
+            "level": Opt(TEXT, "unknown"),
+            "faculty": Opt(TEXT, "unknown"),
+            "teaching_period": Opt(List(TEXT), []),
+            "course_description": Opt(TEXT, ""),
+            "learning_outcomes": Opt(List(TEXT), []),
+            "core_topics": Opt((dict, list), {}),
+        })),
+    }),
+    "past_courses": Obj({
+        "nus_course_code": Opt(TEXT, ""),
+        "past_courses": Opt(List(Obj({
+            "course_name": Req(TEXT),
+            "institution": Req(TEXT),
+            "provider": Opt(TEXT, ""),
+            "justification": Opt(TEXT, ""),
+        })), []),
+        "direct_oulu_links": Opt(List(Obj({
+            "course_name": Req(TEXT),
+            "ects": Opt(NUMBER_OR_TEXT, "?"),
+            "justification": Opt(TEXT, ""),
+        })), []),
+    }),
+    "mapping": Obj({
+        "source_course": Req(TEXT),
+        "target_courses": Opt(List(Obj({
+            "course_code": Req(TEXT),
+            "course_name": Req(TEXT),
+            "ects": Opt(NUMBER_OR_TEXT, "unknown"),
+            "url": Opt(TEXT, ""),
+            "mapping_type": Opt(TEXT, ""),
+            "justification": Opt(TEXT, ""),
+        })), []),
+        "overall_recommendation": Opt(TEXT, "unknown"),
+        "confidence": Opt(TEXT, "unknown"),
+    }),
+    "graph": Obj({
+        "metadata": Opt(dict, {}),
+        "nodes": Req(List(Obj({
+            "id": Req(TEXT),
+            "label": Req(TEXT),
+            "type": Req(Choice("past", "source", "target")),
+        }))),
+        "edges": Opt(List(Obj({
+            "from": Req(TEXT),
+            "to": Req(TEXT),
+            "relation": Opt(TEXT, ""),
+        })), []),
+    }),
+}
+
+CHECKERS = {kind: compile_schema(spec) for kind, spec in SCHEMAS.items()}
+
+# data/ sub-directories and the kind of document they hold
+KIND_DIRS = {
+    "source_courses": "source_course",
+    "target_courses/oulu": "target_course",
+    "past_courses": "past_courses",
+    "mappings": "mapping",
+}
+
+
+def detect_kind(path: Path):
+    """Document kind from a file's location under data/, or None."""
+    path = Path(path)
+    # course_mapping_graph*.json, but not the .manifest.json / .layout.json sidecars
+    if path.parent.name == "exports" and path.name.startswith("course_mapping_graph") and "." not in path.stem:
+        return "graph"
+    for rel_dir, kind in KIND_DIRS.items():
+        if path.parent.as_posix().endswith(rel_dir):
+            return kind
+    return None
+
+
+# ==================================================
+# CACHED VALIDATION
+# ==================================================
+_verdicts = {}
+_hash_by_stamp = {}
+_lock = threading.Lock()
+
+
+def validate_document(doc, kind):
+    errors = []
+    record = CHECKERS[kind](doc, "", errors)
+    return Verdict(not errors, errors, record if not errors else None)
+
+
+def validate_file(path: Path, kind=None):
+    """
+    Verdict for one file, computed once per (kind, content hash). The
+    record is shared between callers — treat it as read-only.
+    """
+    path = Path(path)
+    kind = kind or detect_kind(path)
+    if kind is None:
+        raise ValueError(f"cannot tell the document kind of {path}")
+    if not path.exists():
+        return Verdict(False, ["file not found"], None)
+
+    stat = path.stat()
+    stamp = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        digest = _hash_by_stamp.get(stamp)
+        verdict = _verdicts.get((kind, digest)) if digest else None
+    if verdict is not None:
+        return verdict
+
+    # one read: the bytes that are hashed are the bytes that get decoded
+    data = path.read_bytes()
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    with _lock:
+        _hash_by_stamp[stamp] = digest
+        verdict = _verdicts.get((kind, digest))
+    if verdict is not None:
+        return verdict
+
+    try:
+        verdict = validate_document(codec_for(path).loads(data), kind)
+    except ValueError as e:
+        verdict = Verdict(False, [f"unreadable JSON: {e}"], None)
+
+    with _lock:
+        if len(_verdicts) >= VERDICT_CACHE_MAX:
+            _verdicts.clear()
+            _hash_by_stamp.clear()
+        _verdicts[(kind, digest)] = verdict
+    return verdict
+
+
+def load_valid(path: Path, kind=None):
+    """Normalised record of a valid file, or None if missing or invalid."""
+    return validate_file(path, kind).record
+
+
+def validate_tree(data_dir: Path = DATA_DIR):
+    """[(path, kind, verdict)] for every document under data_dir."""
+    results = []
+    for rel_dir, kind in KIND_DIRS.items():
+        for file in list_json_files(data_dir / rel_dir):
+            results.append((file, kind, validate_file(file, kind)))
+    for file in list_json_files(data_dir / "exports"):
+        if detect_kind(file) == "graph":
+            results.append((file, "graph", validate_file(file, "graph")))
+    return results
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate every document under data/")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    results = validate_tree(args.data_dir)
+    broken = [(file, kind, v) for file, kind, v in results if not v.ok]
+
+    for file, kind, verdict in broken:
+        print(f"❌ {file} ({kind})")
+        for error in verdict.errors:
+            print(f"    {error}")
+
+    if broken:
+        print(f"⚠️ {len(broken)} of {len(results)} files failed validation")
+        return 1
+    print(f"✅ All {len(results)} files are valid")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
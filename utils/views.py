@@ -0,0 +1,119 @@
+"""
+Shared Streamlit view helpers for the pages.
+"""
+
+import streamlit as st
+
+from utils.render_cache import render_cached
+
+
+def graphviz_chart_cached(dot, file_name="course_mapping_graph"):
+    """
+    Show a graphviz.Digraph from the on-disk render cache and offer the SVG
+    as a download. Falls back to st.graphviz_chart (browser-side layout)
+    when the Graphviz executables are not installed on the server.
+    """
+    svg = render_cached(dot, "svg")
+
+    if svg is None:
+        st.graphviz_chart(dot)
+        return
+
+    st.image(svg.decode("utf-8"))
+    st.download_button(
+        label="⬇️ Download graph as SVG",
+        data=svg,
+        file_name=f"{file_name}.svg",
+        mime="image/svg+xml",
+        key=f"download_{file_name}"
+    )
+
+
+# ==================================================
+# PAGINATED VIEWERS
+# ==================================================
+def _page_controls(total, page_size, key):
+    """Page selector; returns the (start, stop) slice to show."""
+    pages = max(1, -(-total // page_size))
+    if pages == 1:
+        return 0, total
+
+    page = st.number_input(
+        f"Page (1–{pages})",
+        min_value=1,
+        max_value=pages,
+        value=1,
+        key=f"{key}_page"
+    )
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total)
+
+
+def paged_dataframe(rows, key, page_size=100):
+    """st.dataframe over one page of rows; only that page is sent to the browser."""
+    start, stop = _page_controls(len(rows), page_size, key)
+    st.dataframe(rows[start:stop], use_container_width=True)
+    if len(rows) > page_size:
+        st.caption(f"Rows {start + 1}–{stop} of {len(rows)}")
+
+
+def _preview(value):
+    if isinstance(value, dict):
+        return f"{{…}} {len(value)} keys"
+    if isinstance(value, list):
+        return f"[…] {len(value)} items"
+    return value
+
+
+def paged_json(data, key, page_size=50):
+    """
+    Lazy tree viewer for a large JSON document. Nothing is serialised until
+    the user asks for it; then only one page of the current node's children
+    is sent, with nested containers shown as one-line previews that can be
+    opened one level at a time. data may be a callable returning the
+    document, so it is only read once the user asks for it.
+    """
+    if not st.checkbox("Load", key=f"{key}_load"):
+        return
+
+    if callable(data):
+        data = data()
+
+    path_key = f"{key}_path"
+    if path_key not in st.session_state:
+        st.session_state[path_key] = []
+    path = st.session_state[path_key]
+
+    node = data
+    try:
+        for step in path:
+            node = node[step]
+    except (KeyError, IndexError, TypeError):
+        # the document changed since the path was opened
+        st.session_state[path_key] = path = []
+        node = data
+        st.info("The document changed since this view was opened — back at the top.")
+
+    st.caption("/" + "/".join(str(step) for step in path))
+
+    if not isinstance(node, (dict, list)):
+        st.json(node)
+    else:
+        children = list(node.items()) if isinstance(node, dict) else list(enumerate(node))
+        node_key = "/".join(str(step) for step in path)
+        start, stop = _page_controls(len(children), page_size, f"{key}_{node_key}")
+        visible = children[start:stop]
+
+        st.json({str(k): _preview(v) for k, v in visible})
+
+        openable = [k for k, v in visible if isinstance(v, (dict, list))]
+        if openable:
+            col_child, col_open = st.columns([4, 1])
+            child = col_child.selectbox("Open", openable, key=f"{key}_child")
+            if col_open.button("Open", key=f"{key}_open"):
+                st.session_state[path_key] = path + [child]
+                st.rerun()
+
+    if path and st.button("⬆ Up", key=f"{key}_up"):
+        st.session_state[path_key] = path[:-1]
+        st.rerun()